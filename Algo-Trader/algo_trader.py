@@ -1,14 +1,64 @@
+import functools
+
 import yfinance as yf
+import numpy as np
 import pandas as pd
 
+from events import EventLogger
+from strategies import IndicatorCache, crossover_signals
+
+
+# ------------------------------
+# Array helpers for compact (float32) mode
+# ------------------------------
+def ffill_array(values):
+    """Forward-fill NaNs in a 1-D array (leading NaNs stay NaN, like DataFrame.ffill)."""
+    mask = np.isnan(values)
+    if not mask.any():
+        return values
+    idx = np.where(mask, 0, np.arange(len(values)))
+    np.maximum.accumulate(idx, out=idx)
+    return values[idx]
+
+
+def timed_stage(name: str):
+    """Record wall time and row count of an AlgoTrader pipeline step on its event logger."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.logger.stage(name, symbol=self.symbol) as stats:
+                result = method(self, *args, **kwargs)
+                stats["rows"] = self.row_count()
+            return result
+        return wrapper
+    return decorator
+
 
 class AlgoTrader:
-    def __init__(self, symbol: str, from_date: str, to_date: str, budget: float = 5000):
+    def __init__(self, symbol: str, from_date: str, to_date: str, budget: float = 5000,
+                 fast_window: int = 50, slow_window: int = 200, cache=None,
+                 compact: bool = False, strategy=None, indicators=None, logger=None):
         self.symbol = symbol
         self.from_date = from_date
         self.to_date = to_date
         self.budget = budget
+        self.fast_window = fast_window
+        self.slow_window = slow_window
+        self.fast_column = f"MA{fast_window}"
+        self.slow_column = f"MA{slow_window}"
+        self.cache = cache    # optional PriceCache; None = always download from yfinance
         self.data = None
+        # Compact mode keeps only Close as a contiguous float32 (or memory-mapped) array
+        self.compact = compact
+        self.dates = None
+        self.close = None
+        self.ma_fast = None
+        self.ma_slow = None
+        # Optional pluggable Strategy (see strategies.py); None = built-in Golden Cross on MA columns
+        self.strategy = strategy
+        self.indicators = indicators if indicators is not None else IndicatorCache()
+        # Console output and structured stage/trade events (see events.py)
+        self.logger = logger if logger is not None else EventLogger()
         self.position = 0     # 0 = no position, 1 = holding stock
         self.buy_price = 0.0
         self.shares = 0
@@ -24,37 +74,102 @@ class AlgoTrader:
             return float(value.iloc[0])
         return float(value)
 
+    def row_count(self):
+        """Number of bars currently loaded (DataFrame rows or compact array length)."""
+        if self.compact:
+            return 0 if self.close is None else len(self.close)
+        return 0 if self.data is None else len(self.data)
+
     # Step 1: Download data
+    @timed_stage("download_data")
     def download_data(self):
-        print(f"Downloading {self.symbol} data from {self.from_date} to {self.to_date}...")
-        self.data = yf.download(self.symbol, start=self.from_date, end=self.to_date, auto_adjust=False) # Download daily historical stock prices
-        print("Data downloaded successfully!")
+        self.logger.info(f"Downloading {self.symbol} data from {self.from_date} to {self.to_date}...")
+        if self.compact and self.cache is not None:
+            # Memory-mapped Close/date arrays straight from the cache, no DataFrame
+            self.dates, self.close = self.cache.get_close_array(self.symbol, self.from_date, self.to_date)
+        elif self.compact:
+            # yfinance only returns the full float64 OHLCV frame; it is dropped once Close is copied
+            data = yf.download(self.symbol, start=self.from_date, end=self.to_date, auto_adjust=False)
+            self.dates = data.index.values
+            self.close = np.ascontiguousarray(np.asarray(data["Close"], dtype=np.float32).reshape(len(data), -1)[:, 0])
+        elif self.cache is not None:
+            # Serve from the local price cache, fetching only missing date ranges
+            self.data = self.cache.get(self.symbol, self.from_date, self.to_date)
+        else:
+            self.data = yf.download(self.symbol, start=self.from_date, end=self.to_date, auto_adjust=False) # Download daily historical stock prices
+        self.logger.info("Data downloaded successfully!")
 
     # Step 2: Clean data
+    @timed_stage("clean_data")
     def clean_data(self):
-        print("Cleaning data...")
+        self.logger.info("Cleaning data...")
+        if self.compact:
+            # Drop duplicate dates (keep first) and forward-fill, copying only when needed
+            if len(self.dates) > 1 and not (np.diff(self.dates) > np.timedelta64(0)).all():
+                _, first = np.unique(self.dates, return_index=True)
+                self.dates, self.close = self.dates[first], self.close[first]
+            self.close = ffill_array(self.close)
+            self.logger.info("Data cleaned successfully!")
+            return
         # Download daily historical stock prices
         self.data = self.data[~self.data.index.duplicated(keep='first')]
         # Forward-fill missing (NaN) values using previous day's data
         self.data = self.data.ffill()
-        print("Data cleaned successfully!")
+        self.logger.info("Data cleaned successfully!")
 
     # Step 3: Calculate moving averages
+    @timed_stage("calculate_moving_averages")
     def calculate_moving_averages(self):
-        # Add two new columns for moving averages
-        self.data["MA50"] = self.data["Close"].rolling(window=50).mean()
-        self.data["MA200"] = self.data["Close"].rolling(window=200).mean()
-        print("Moving averages calculated!")
+        # Served from the indicator cache, so a strategy or a later run on the same series reuses them
+        if self.compact:
+            self.ma_fast = self.indicators.get(self.symbol, "sma_f32", (self.fast_window,), self.close)
+            self.ma_slow = self.indicators.get(self.symbol, "sma_f32", (self.slow_window,), self.close)
+            self.logger.info("Moving averages calculated!")
+            return
+        # Add two new columns for moving averages (MA50/MA200 with the default windows)
+        close = self.get_column_array("Close")
+        self.data[self.fast_column] = self.indicators.get(self.symbol, "sma", (self.fast_window,), close)
+        self.data[self.slow_column] = self.indicators.get(self.symbol, "sma", (self.slow_window,), close)
+        self.logger.info("Moving averages calculated!")
+
+    # ------------------------------
+    # Utility: column as a flat float array
+    # ------------------------------
+    def get_column_array(self, column):
+        """Return a DataFrame column as a 1-D float64 NumPy array (handles yfinance MultiIndex columns)."""
+        values = np.asarray(self.data[column], dtype=np.float64)
+        if values.ndim > 1:
+            values = values[:, 0]
+        return values
 
     # Step 4: Apply strategy
-    def apply_strategy(self):
-        print("Applying Golden Cross strategy...")
+    @timed_stage("apply_strategy")
+    def apply_strategy(self, engine: str = "loop"):
+        """Run the Golden Cross strategy (or the pluggable `strategy`, if one was given).
+
+        engine="loop" walks every row and is kept as the reference implementation.
+        engine="vectorized" finds the crossovers with whole-array operations and only
+        visits the crossover days, producing the same trades, cash and profit.
+        """
+        if engine == "loop":
+            if self.compact:
+                raise ValueError("Compact mode has no DataFrame; use engine='vectorized'.")
+            if self.strategy is not None:
+                raise ValueError("Pluggable strategies run on the vectorized engine; use engine='vectorized'.")
+            self._apply_strategy_loop()
+        elif engine == "vectorized":
+            self._apply_strategy_vectorized()
+        else:
+            raise ValueError(f"Unknown engine '{engine}'. Use 'loop' or 'vectorized'.")
+
+    def _apply_strategy_loop(self):
+        self.logger.info("Applying Golden Cross strategy...")
         # Loop through data starting from day 1 (since we compare with previous day)
         for i in range(1, len(self.data)):
-            ma50_yesterday = self.get_scalar(self.data["MA50"].iloc[i - 1])
-            ma200_yesterday = self.get_scalar(self.data["MA200"].iloc[i - 1])
-            ma50_today = self.get_scalar(self.data["MA50"].iloc[i])
-            ma200_today = self.get_scalar(self.data["MA200"].iloc[i])
+            ma50_yesterday = self.get_scalar(self.data[self.fast_column].iloc[i - 1])
+            ma200_yesterday = self.get_scalar(self.data[self.slow_column].iloc[i - 1])
+            ma50_today = self.get_scalar(self.data[self.fast_column].iloc[i])
+            ma200_today = self.get_scalar(self.data[self.slow_column].iloc[i])
             close_price = self.get_scalar(self.data["Close"].iloc[i])
 
             # When 50-day MA crosses ABOVE 200-day MA send Golden Cross (Buy) signal
@@ -71,7 +186,39 @@ class AlgoTrader:
         if self.position == 1:
             last_close = self.get_scalar(self.data["Close"].iloc[-1])
             self.sell_stock(last_close)
-            print("Position forcefully closed at the end of data period.")
+            self.logger.info("Position forcefully closed at the end of data period.")
+
+    def _apply_strategy_vectorized(self):
+        close = self.close if self.compact else self.get_column_array("Close")
+        if self.strategy is not None:
+            self.logger.info(f"Applying {self.strategy!r} strategy (vectorized)...")
+            signals = self.strategy.signals(self.symbol, close, self.indicators)
+        else:
+            self.logger.info("Applying Golden Cross strategy (vectorized)...")
+            if self.compact:
+                ma50, ma200 = self.ma_fast, self.ma_slow
+            else:
+                ma50 = self.get_column_array(self.fast_column)
+                ma200 = self.get_column_array(self.slow_column)
+            # Crossover signals for every day in one pass (NaN comparisons are False, as in the loop)
+            signals = crossover_signals(ma50, ma200)
+
+        # Only the signal days can change state; fill prices are gathered in bulk
+        event_days = np.flatnonzero(signals)
+        event_signals = signals[event_days]
+        fill_prices = close[event_days]
+
+        # Position/cash state machine over the (few) signal days only
+        for signal, price in zip(event_signals.tolist(), fill_prices.tolist()):
+            if signal == 1 and self.position == 0:
+                self.buy_stock(price, self.cash)
+            elif signal == -1 and self.position == 1:
+                self.sell_stock(price)
+
+        # Force close open position at end
+        if self.position == 1:
+            self.sell_stock(float(close[-1]))
+            self.logger.info("Position forcefully closed at the end of data period.")
 
     # Step 5: Buy and Sell methods
     def buy_stock(self, price, available_cash):
@@ -82,7 +229,8 @@ class AlgoTrader:
             self.buy_price = price
             self.cash -= self.shares * price
             self.position = 1
-            print(f"Bought {self.shares} shares of {self.symbol} at ${price:.2f}")
+            self.logger.trade(f"Bought {self.shares} shares of {self.symbol} at ${price:.2f}",
+                              side="buy", symbol=self.symbol, shares=self.shares, price=price, cash=self.cash)
 
     def sell_stock(self, price):
         price = self.get_scalar(price)
@@ -91,25 +239,29 @@ class AlgoTrader:
             self.cash += sell_value
             trade_profit = sell_value - (self.shares * self.buy_price)
             self.profit += trade_profit
-            print(f"Sold {self.shares} shares of {self.symbol} at ${price:.2f} | Trade Profit: ${trade_profit:.2f}")
+            self.logger.trade(f"Sold {self.shares} shares of {self.symbol} at ${price:.2f} | Trade Profit: ${trade_profit:.2f}",
+                              side="sell", symbol=self.symbol, shares=self.shares, price=price, cash=self.cash,
+                              profit=trade_profit)
             self.position = 0
             self.shares = 0
 
     # Step 6: Evaluate performance
     def evaluate_performance(self):
         total_value = self.cash
-        print("\n========== FINAL REPORT ==========")
-        print(f"Symbol: {self.symbol}")
-        print(f"Initial Budget: ${self.budget:.2f}")
-        print(f"Ending Cash: ${self.cash:.2f}")
-        print(f"Total Profit/Loss: ${self.profit:.2f}")
-        print(f"Return on Investment: {((total_value - self.budget) / self.budget) * 100:.2f}%")
-        print("==================================")
+        self.logger.info("\n========== FINAL REPORT ==========")
+        self.logger.info(f"Symbol: {self.symbol}")
+        self.logger.info(f"Initial Budget: ${self.budget:.2f}")
+        self.logger.info(f"Ending Cash: ${self.cash:.2f}")
+        self.logger.info(f"Total Profit/Loss: ${self.profit:.2f}")
+        self.logger.info(f"Return on Investment: {((total_value - self.budget) / self.budget) * 100:.2f}%")
+        self.logger.info("==================================")
+        self.logger.emit("report", symbol=self.symbol, budget=self.budget, cash=self.cash, profit=self.profit)
         return {
             "Symbol": self.symbol,
             "Initial Budget": self.budget,
             "Ending Cash": self.cash,
             "Profit/Loss": self.profit,
+            "ROI": ((total_value - self.budget) / self.budget) * 100,
         }
 
 
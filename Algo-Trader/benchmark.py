@@ -0,0 +1,149 @@
+import argparse
+import json
+import math
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from algo_trader import AlgoTrader
+from events import SILENT, EventLogger, ListSink
+from streaming import StreamingGoldenCross
+
+
+# ------------------------------
+# Deterministic synthetic prices
+# ------------------------------
+def generate_ohlcv(n_bars: int, seed: int = 42, gap_rate: float = 0.01,
+                   duplicate_rate: float = 0.001, nan_rate: float = 0.001):
+    """Random-walk OHLCV frame with date gaps, duplicated index rows and NaNs (to exercise clean_data)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    spread = np.abs(rng.normal(0, 0.005, n_bars)) * close
+    data = pd.DataFrame({
+        "Open": close + rng.normal(0, 0.002, n_bars) * close,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Adj Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, n_bars).astype(np.float64),
+    })
+
+    # Minute bars with random gaps: skip extra steps between some bars
+    steps = 1 + (rng.random(n_bars) < gap_rate) * rng.integers(1, 60, n_bars)
+    data.index = pd.Timestamp("2000-01-03 09:30") + pd.to_timedelta(np.cumsum(steps), unit="min")
+    data.index.name = "Date"
+
+    # NaNs in every column for a few bars
+    data.iloc[rng.random(n_bars) < nan_rate] = np.nan
+
+    # Duplicate some rows (same timestamp) right after the original
+    duplicates = data.iloc[rng.random(n_bars) < duplicate_rate]
+    return pd.concat([data, duplicates]).sort_index(kind="stable")
+
+
+# ------------------------------
+# Stage timing
+# ------------------------------
+def time_stage(func, rows: int):
+    """Run one pipeline stage; return wall time, rows/sec and peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 6),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "peak_mb": round(peak / 2**20, 3),
+    }
+
+
+def run_streaming(raw):
+    """Feed the raw closes (NaNs included) bar by bar through StreamingGoldenCross."""
+    trader = AlgoTrader("SYNTH", "", "", logger=EventLogger(verbosity=SILENT))
+    engine = StreamingGoldenCross(trader)
+    # A live feed has one bar per timestamp; NaN bars are left for on_bar to forward-fill
+    closes = raw["Close"][~raw.index.duplicated(keep="first")].to_numpy()
+
+    def feed():
+        for close in closes:
+            engine.on_bar(close)
+        engine.close()
+    return trader, time_stage(feed, len(closes))
+
+
+def trades_match(trades, reference, rtol):
+    """Same buy/sell sequence, with fill prices equal within rtol (float32 rounding)."""
+    return len(trades) == len(reference) and all(
+        side == ref_side and math.isclose(price, ref_price, rel_tol=rtol)
+        for (side, price), (ref_side, ref_price) in zip(trades, reference))
+
+
+def run_benchmark(n_bars: int, seed: int = 42, engines=("vectorized", "loop", "streaming", "compact"),
+                  loop_max_bars: int = 100_000, compact_rtol: float = 1e-6):
+    """Benchmark clean_data, calculate_moving_averages and apply_strategy on one synthetic series."""
+    raw = generate_ohlcv(n_bars, seed)
+    result = {"bars": n_bars, "rows": len(raw), "stages": {}, "ending_cash": {}}
+    trades = {}
+
+    for engine in engines:
+        if engine in ("loop", "streaming") and n_bars > loop_max_bars:
+            continue
+        if engine == "streaming":
+            trader, stage = run_streaming(raw)
+            result["stages"][engine] = {"on_bar": stage}
+        else:
+            sink = ListSink()
+            trader = AlgoTrader("SYNTH", "", "", compact=engine == "compact",
+                                logger=EventLogger(verbosity=SILENT, sinks=[sink]))
+            if trader.compact:
+                # The arrays download_data builds in compact mode: dates plus float32 Close
+                trader.dates = raw.index.values
+                trader.close = np.ascontiguousarray(raw["Close"].to_numpy(dtype=np.float32))
+            else:
+                trader.data = raw.copy()
+            apply_engine = "vectorized" if trader.compact else engine
+            stages = {
+                "clean_data": time_stage(trader.clean_data, len(raw)),
+            }
+            stages["calculate_moving_averages"] = time_stage(trader.calculate_moving_averages, len(raw))
+            stages["apply_strategy"] = time_stage(lambda: trader.apply_strategy(engine=apply_engine), len(raw))
+            result["stages"][engine] = stages
+            trades[engine] = [(r["side"], r["price"]) for r in sink.records if r["event"] == "trade"]
+        result["ending_cash"][engine] = trader.cash
+
+    # The float64 engines must agree exactly wherever the row-by-row engines ran
+    exact = {engine: cash for engine, cash in result["ending_cash"].items() if engine != "compact"}
+    if len(exact) > 1:
+        result["engines_match"] = len(set(exact.values())) == 1
+    # Compact mode must make the same trades on the same bars; its float32 fill prices can change
+    # whole-share counts, and that drift compounds over many trades, so cash is only reported
+    reference = next((engine for engine in ("vectorized", "loop") if engine in trades), None)
+    if "compact" in trades and reference is not None:
+        result["compact_match"] = trades_match(trades["compact"], trades[reference], compact_rtol)
+        result["compact_cash_drift"] = result["ending_cash"]["compact"] / result["ending_cash"][reference] - 1
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline AlgoTrader pipeline benchmark on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engines", nargs="+", default=["vectorized", "loop", "streaming", "compact"],
+                        choices=["vectorized", "loop", "streaming", "compact"])
+    parser.add_argument("--loop-max-bars", type=int, default=100_000,
+                        help="Skip the row-by-row loop and streaming engines above this many bars")
+    parser.add_argument("--compact-rtol", type=float, default=1e-6,
+                        help="Relative tolerance for compact (float32) fill prices against the float64 path")
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout")
+    args = parser.parse_args()
+
+    report = [run_benchmark(n, args.seed, args.engines, args.loop_max_bars, args.compact_rtol) for n in args.sizes]
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
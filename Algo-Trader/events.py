@@ -0,0 +1,77 @@
+import json
+import time
+from contextlib import contextmanager
+
+# Verbosity levels
+SILENT = 0    # no console output; records still go to sinks
+SUMMARY = 1   # stage messages and final report
+TRADES = 2    # everything, including each buy/sell (the original print output)
+
+
+# ------------------------------
+# Sinks: receive one dict per event
+# ------------------------------
+class ListSink:
+    """Keep events in memory (handy for sweeps and notebooks)."""
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+
+class JsonlSink:
+    """Append events as JSON lines to a file."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "a")
+
+    def __call__(self, record):
+        self.file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class EventLogger:
+    """Console messages with adjustable verbosity plus structured events for pluggable sinks.
+
+    Stage timings are also summed per stage name in `stage_seconds` / `stage_rows`.
+    """
+
+    def __init__(self, verbosity: int = TRADES, sinks=None):
+        self.verbosity = verbosity
+        self.sinks = list(sinks or [])
+        self.stage_seconds = {}
+        self.stage_rows = {}
+
+    def info(self, message: str, level: int = SUMMARY):
+        if self.verbosity >= level:
+            print(message)
+
+    def emit(self, event: str, **fields):
+        if not self.sinks:
+            return
+        record = {"event": event, "time": time.time(), **fields}
+        for sink in self.sinks:
+            sink(record)
+
+    def trade(self, message: str, **fields):
+        """A buy/sell: printed at TRADES verbosity and always recorded."""
+        self.info(message, level=TRADES)
+        self.emit("trade", **fields)
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """Time a pipeline stage; set stats["rows"] inside the block to record its row count."""
+        stats = {}
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            seconds = time.perf_counter() - start
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+            if "rows" in stats:
+                self.stage_rows[name] = self.stage_rows.get(name, 0) + stats["rows"]
+            self.emit("stage", stage=name, seconds=seconds, rows=stats.get("rows"), **fields)
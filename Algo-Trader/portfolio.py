@@ -0,0 +1,136 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from algo_trader import AlgoTrader
+from price_cache import PriceCache
+from strategies import IndicatorCache, SMACrossover
+
+
+def load_prices(symbols, from_date: str, to_date: str, cache=None):
+    """Download and clean each symbol and align the Close prices on one shared date index."""
+    closes = {}
+    for symbol in symbols:
+        trader = AlgoTrader(symbol, from_date, to_date, cache=cache)
+        trader.download_data()
+        trader.clean_data()
+        closes[symbol] = pd.Series(trader.get_column_array("Close"), index=trader.data.index)
+    return pd.DataFrame(closes).sort_index()
+
+
+class PortfolioBacktester:
+    """Run one strategy over many symbols against a single cash pool.
+
+    Each symbol's signals turn into a held/not-held state. Whenever the held set changes,
+    the portfolio is rebalanced at that bar's close to equal slots of 1/max_positions of
+    equity (scaled down if more symbols are held than there are slots); in between, held
+    positions drift with their prices. Commission plus slippage are charged on the traded
+    fraction of equity, measured against the drifted weights. Signal generation and the
+    drift between rebalances are whole-matrix NumPy work over (dates x symbols); only the
+    rebalance bars are visited one by one.
+    """
+
+    def __init__(self, prices: pd.DataFrame, budget: float = 100000, strategy=None,
+                 commission: float = 0.0005, slippage: float = 0.0005, max_positions: int = None,
+                 indicators=None, periods_per_year: int = 252):
+        self.prices = prices.ffill()
+        self.budget = budget
+        self.strategy = strategy or SMACrossover()
+        self.commission = commission    # fraction of traded value
+        self.slippage = slippage        # fraction of traded value
+        self.max_positions = max_positions or prices.shape[1]
+        self.indicators = indicators if indicators is not None else IndicatorCache()
+        self.periods_per_year = periods_per_year
+
+    def signals(self):
+        """Per-bar signal matrix (+1 buy, -1 sell, 0 hold), one strategy call per symbol."""
+        values = self.prices.to_numpy(dtype=np.float64)
+        out = np.zeros(values.shape, dtype=np.int8)
+        for j, symbol in enumerate(self.prices.columns):
+            out[:, j] = self.strategy.signals(symbol, values[:, j], self.indicators)
+        return out
+
+    def run(self):
+        prices = self.prices.to_numpy(dtype=np.float64)
+        signals = self.signals()
+
+        # Holding state: last buy/sell wins; start flat
+        state = np.where(signals == 1, 1.0, np.where(signals == -1, 0.0, np.nan))
+        state = pd.DataFrame(state).ffill().fillna(0.0).to_numpy()
+
+        # Equal-slot target weights from the shared cash pool
+        held = state.sum(axis=1, keepdims=True)
+        targets = state / np.maximum(held, self.max_positions)
+
+        # Growth of one unit held since bar 0; weights set at the close of bar t earn from bar t+1
+        returns = np.zeros_like(prices)
+        returns[1:] = prices[1:] / prices[:-1] - 1
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        growth = np.cumprod(1 + returns, axis=0)
+
+        # Rebalance only on bars where some target changes; positions drift in between
+        cost = self.commission + self.slippage
+        rebalances = np.flatnonzero((np.diff(targets, axis=0, prepend=0.0) != 0).any(axis=1))
+        equity = np.full(len(prices), float(self.budget))
+        turnover = np.zeros(len(prices))
+        value, weights, last = float(self.budget), np.zeros(prices.shape[1]), 0
+        for t in [*rebalances.tolist(), len(prices)]:
+            end = min(t, len(prices) - 1)
+            drifted = weights
+            if end > last:
+                grown = weights * growth[last + 1:end + 1] / growth[last]   # holdings per unit of equity at `last`
+                relative = (1 - weights.sum()) + grown.sum(axis=1)
+                equity[last + 1:end + 1] = value * relative
+                value, drifted = equity[end], grown[-1] / relative[-1]
+            if t == len(prices):
+                break
+            # Costs on the traded fraction of equity, against the drifted weights
+            turnover[t] = np.abs(targets[t] - drifted).sum()
+            value *= 1 - turnover[t] * cost
+            equity[t] = value
+            weights, last = targets[t], t
+
+        net = np.zeros(len(prices))
+        net[1:] = equity[1:] / equity[:-1] - 1
+        drawdown = equity / np.maximum.accumulate(equity) - 1
+        std = net[1:].std()
+        years = max(len(net) / self.periods_per_year, 1e-9)
+
+        self.equity = pd.Series(equity, index=self.prices.index, name="Equity")
+        return {
+            "Initial Budget": self.budget,
+            "Ending Equity": float(equity[-1]),
+            "Return (%)": float((equity[-1] / self.budget - 1) * 100),
+            "Sharpe": float(net[1:].mean() / std * np.sqrt(self.periods_per_year)) if std > 0 else 0.0,
+            "Max Drawdown (%)": float(drawdown.min() * 100),
+            "Turnover (per year)": float(turnover.sum() / years),
+            "Trades": int(np.count_nonzero(np.diff(state, axis=0, prepend=0.0))),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Portfolio-level Golden Cross backtest")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--from-date", default="2018-01-01")
+    parser.add_argument("--to-date", default="2023-12-31")
+    parser.add_argument("--budget", type=float, default=100000)
+    parser.add_argument("--commission", type=float, default=0.0005, help="Commission as a fraction of traded value")
+    parser.add_argument("--slippage", type=float, default=0.0005, help="Slippage as a fraction of traded value")
+    parser.add_argument("--max-positions", type=int, default=None)
+    parser.add_argument("--cache-dir", help="Serve prices from a local PriceCache in this directory")
+    parser.add_argument("--equity-output", help="Optional CSV path for the per-bar equity curve")
+    args = parser.parse_args()
+
+    cache = PriceCache(args.cache_dir) if args.cache_dir else None
+    prices = load_prices(args.symbols, args.from_date, args.to_date, cache=cache)
+    backtester = PortfolioBacktester(prices, budget=args.budget, commission=args.commission,
+                                     slippage=args.slippage, max_positions=args.max_positions)
+    report = backtester.run()
+
+    print("\n========== PORTFOLIO REPORT ==========")
+    for key, value in report.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    print("======================================")
+    if args.equity_output:
+        backtester.equity.to_csv(args.equity_output)
@@ -0,0 +1,181 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from events import EventLogger
+
+
+# ------------------------------
+# Data providers
+# ------------------------------
+class YFinanceProvider:
+    """Fetch daily bars from Yahoo Finance."""
+
+    def fetch(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        import yfinance as yf
+
+        data = yf.download(symbol, start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"),
+                           auto_adjust=False, progress=False)
+        # yfinance returns (Price, Ticker) columns; keep just the price level for storage
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        return data
+
+
+class CSVProvider:
+    """Serve bars from local <SYMBOL>.csv files (Date index column); used for offline runs and tests."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def fetch(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        path = os.path.join(self.directory, f"{symbol}.csv")
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        return data[(data.index >= start) & (data.index < end)]
+
+
+# ------------------------------
+# On-disk cache
+# ------------------------------
+class PriceCache:
+    """Persistent per-symbol Parquet cache in front of a data provider.
+
+    For each symbol the cache stores the bars in <symbol>.parquet and the date ranges
+    already fetched (with fetch time) in <symbol>.json. A request only fetches the parts
+    of [start, end) that are not covered yet and merges them into the stored frame.
+    Bars from the last `recent_days` days are considered unsettled and are fetched again
+    once they are older than `max_age_hours`. Fetch/serve messages go to `logger`.
+    """
+
+    def __init__(self, cache_dir: str = ".price_cache", provider=None,
+                 recent_days: int = 5, max_age_hours: float = 12, logger=None):
+        self.cache_dir = cache_dir
+        self.provider = provider or YFinanceProvider()
+        self.recent_days = recent_days
+        self.max_age_hours = max_age_hours
+        self.logger = logger if logger is not None else EventLogger()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Paths and metadata
+    def _data_path(self, symbol):
+        return os.path.join(self.cache_dir, f"{symbol}.parquet")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self.cache_dir, f"{symbol}.json")
+
+    def _array_paths(self, symbol):
+        return (os.path.join(self.cache_dir, f"{symbol}.dates.npy"),
+                os.path.join(self.cache_dir, f"{symbol}.close.f32.npy"))
+
+    def _load_ranges(self, symbol):
+        ranges = []
+        if os.path.exists(self._meta_path(symbol)):
+            with open(self._meta_path(symbol)) as f:
+                ranges = [(pd.Timestamp(s), pd.Timestamp(e), pd.Timestamp(t)) for s, e, t in json.load(f)["ranges"]]
+        return ranges
+
+    def _load(self, symbol):
+        data = None
+        if os.path.exists(self._data_path(symbol)):
+            data = pd.read_parquet(self._data_path(symbol))
+        return data, self._load_ranges(symbol)
+
+    def _save(self, symbol, data, ranges):
+        data.to_parquet(self._data_path(symbol))
+        # Flat Close/date arrays next to the Parquet file so compact runs can memory-map them
+        dates_path, close_path = self._array_paths(symbol)
+        np.save(dates_path, data.index.values.astype("datetime64[ns]"))
+        close = np.asarray(data["Close"], dtype=np.float32) if "Close" in data else np.empty(0, np.float32)
+        np.save(close_path, np.ascontiguousarray(close))
+        with open(self._meta_path(symbol), "w") as f:
+            json.dump({"ranges": [[s.isoformat(), e.isoformat(), t.isoformat()] for s, e, t in ranges]}, f)
+
+    # Range bookkeeping
+    def _fresh_ranges(self, ranges, now):
+        """Covered ranges, cut back to the recent-bar boundary where the fetch has expired."""
+        cutoff = now.normalize() - pd.Timedelta(days=self.recent_days)
+        max_age = pd.Timedelta(hours=self.max_age_hours)
+        fresh = []
+        for start, end, fetched_at in ranges:
+            if end > cutoff and now - fetched_at > max_age:
+                end = min(end, cutoff)
+            if start < end:
+                fresh.append((start, end))
+        return fresh
+
+    @staticmethod
+    def _missing_ranges(start, end, covered):
+        """Subtract the covered [s, e) intervals from [start, end)."""
+        missing = []
+        cursor = start
+        for s, e in sorted(covered):
+            if e <= cursor or s >= end:
+                continue
+            if s > cursor:
+                missing.append((cursor, s))
+            cursor = max(cursor, e)
+            if cursor >= end:
+                break
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    @classmethod
+    def _merge_ranges(cls, ranges):
+        """Make ranges disjoint, the newest fetch winning where they overlap, then join neighbours
+        that were fetched at the same time. A re-fetched recent window keeps its new fetch time."""
+        pieces = []
+        for start, end, fetched_at in sorted(ranges, key=lambda r: r[2], reverse=True):
+            for s, e in cls._missing_ranges(start, end, [(p[0], p[1]) for p in pieces]):
+                pieces.append((s, e, fetched_at))
+        merged = []
+        for start, end, fetched_at in sorted(pieces):
+            if merged and start <= merged[-1][1] and fetched_at == merged[-1][2]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end), fetched_at)
+            else:
+                merged.append((start, end, fetched_at))
+        return merged
+
+    # Public API
+    def get(self, symbol: str, start, end) -> pd.DataFrame:
+        """Return bars for symbol in [start, end), fetching only the ranges not cached yet."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        now = pd.Timestamp.now()
+        data, ranges = self._load(symbol)
+
+        missing = self._missing_ranges(start, end, self._fresh_ranges(ranges, now))
+        if missing:
+            frames = [] if data is None else [data]
+            for miss_start, miss_end in missing:
+                self.logger.info(f"Fetching {symbol} {miss_start.date()} -> {miss_end.date()} from provider...")
+                self.logger.emit("cache_fetch", symbol=symbol, start=miss_start, end=miss_end)
+                frames.append(self.provider.fetch(symbol, miss_start, miss_end))
+                ranges.append((miss_start, miss_end, now))
+            data = pd.concat([f for f in frames if not f.empty] or frames[:1])
+            # Newly fetched bars win over stored ones for the same date
+            data = data[~data.index.duplicated(keep="last")].sort_index()
+            self._save(symbol, data, self._merge_ranges(ranges))
+        else:
+            self.logger.info(f"Serving {symbol} {start.date()} -> {end.date()} from cache.")
+            self.logger.emit("cache_hit", symbol=symbol, start=start, end=end)
+
+        return data[(data.index >= start) & (data.index < end)]
+
+    def get_close_array(self, symbol: str, start, end):
+        """Return (dates, close) for [start, end) as memory-mapped datetime64/float32 arrays.
+
+        Missing ranges are fetched through get() first; fully cached requests never build a DataFrame.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        ranges = self._load_ranges(symbol)
+        dates_path, close_path = self._array_paths(symbol)
+        missing = self._missing_ranges(start, end, self._fresh_ranges(ranges, pd.Timestamp.now()))
+        if missing or not os.path.exists(close_path):
+            self.get(symbol, start, end)
+
+        dates = np.load(dates_path, mmap_mode="r")
+        close = np.load(close_path, mmap_mode="r")
+        lo, hi = np.searchsorted(dates, [np.datetime64(start, "ns"), np.datetime64(end, "ns")])
+        return dates[lo:hi], close[lo:hi]
@@ -0,0 +1,189 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+# ------------------------------
+# Indicators (whole-array, NaN until enough history)
+# ------------------------------
+def sma(close, window: int):
+    """Simple moving average (identical to rolling(window).mean())."""
+    return pd.Series(close, dtype=np.float64).rolling(window=window).mean().to_numpy()
+
+
+def rolling_mean_array(values, window: int, dtype=np.float32):
+    """Trailing moving average of a 1-D array; the first window-1 values are NaN, like rolling().mean()."""
+    out = np.full(len(values), np.nan, dtype=dtype)
+    start = int(np.argmax(~np.isnan(values))) if len(values) else 0   # skip leading NaNs
+    valid = values[start:]
+    if len(valid) >= window:
+        # float64 prefix sums keep the float32 result accurate on long histories
+        csum = np.cumsum(valid, dtype=np.float64)
+        sums = csum[window - 1:].copy()
+        sums[1:] -= csum[:-window]
+        out[start + window - 1:] = sums / window
+    return out
+
+
+def ema(close, span: int):
+    """Exponential moving average, NaN for the first span-1 bars."""
+    values = pd.Series(close, dtype=np.float64).ewm(span=span, adjust=False, min_periods=span).mean()
+    return values.to_numpy()
+
+
+def rsi(close, period: int = 14):
+    """Wilder's Relative Strength Index (0-100)."""
+    delta = pd.Series(close, dtype=np.float64).diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    return (100 - 100 / (1 + gain / loss)).to_numpy()
+
+
+def bollinger(close, window: int = 20, num_std: float = 2.0):
+    """Bollinger bands as a (lower, middle, upper) tuple of arrays."""
+    series = pd.Series(close, dtype=np.float64)
+    middle = series.rolling(window=window).mean()
+    std = series.rolling(window=window).std()
+    return ((middle - num_std * std).to_numpy(), middle.to_numpy(), (middle + num_std * std).to_numpy())
+
+
+INDICATORS = {
+    "sma": sma,
+    "sma_f32": rolling_mean_array,
+    "ema": ema,
+    "rsi": rsi,
+    "bollinger": bollinger,
+}
+
+
+def series_key(close):
+    """Identity of a price array: dtype, length and a hash of every value.
+
+    A different date range, a re-fetched history or a vendor correction in the middle of the
+    series gets a different key. Hashing is cheap next to computing a rolling indicator.
+    """
+    values = np.ascontiguousarray(close)
+    return (values.dtype.str, len(values), hashlib.blake2b(values.view(np.uint8), digest_size=16).digest())
+
+
+class IndicatorCache:
+    """Memoizes indicator arrays by (symbol, series, indicator, params).
+
+    Strategies ask the cache instead of computing indicators themselves, so a sweep that
+    reuses e.g. SMA(50) across many strategies computes it once per symbol. The series
+    part (see series_key) keeps results for one symbol's different histories apart.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol: str, name: str, params: tuple, close):
+        key = (symbol, series_key(close), name, params)
+        if key in self._values:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._values[key] = INDICATORS[name](close, *params)
+        return self._values[key]
+
+    def clear(self, symbol: str = None):
+        if symbol is None:
+            self._values.clear()
+        else:
+            self._values = {k: v for k, v in self._values.items() if k[0] != symbol}
+
+
+# ------------------------------
+# Signal helpers
+# ------------------------------
+def crossover_signals(fast, slow):
+    """+1 on the bar fast crosses above slow, -1 on the bar it crosses below, else 0 (bar 0 is always 0)."""
+    signals = np.zeros(len(fast), dtype=np.int8)
+    golden_cross = (fast[:-1] < slow[:-1]) & (fast[1:] > slow[1:])
+    death_cross = (fast[:-1] > slow[:-1]) & (fast[1:] < slow[1:])
+    signals[1:] = golden_cross.astype(np.int8) - death_cross.astype(np.int8)
+    return signals
+
+
+# ------------------------------
+# Strategies
+# ------------------------------
+class Strategy:
+    """Base class: turn a Close array into per-bar signals (+1 buy, -1 sell, 0 hold)."""
+
+    name = "strategy"
+
+    def signals(self, symbol: str, close, indicators: IndicatorCache):
+        raise NotImplementedError
+
+    def __repr__(self):
+        params = ", ".join(f"{k}={v}" for k, v in vars(self).items())
+        return f"{type(self).__name__}({params})"
+
+
+class SMACrossover(Strategy):
+    """Golden Cross / Death Cross on simple moving averages (the default 50/200 rules)."""
+
+    name = "sma_crossover"
+
+    def __init__(self, fast: int = 50, slow: int = 200):
+        self.fast = fast
+        self.slow = slow
+
+    def signals(self, symbol, close, indicators):
+        return crossover_signals(indicators.get(symbol, "sma", (self.fast,), close),
+                                 indicators.get(symbol, "sma", (self.slow,), close))
+
+
+class EMACrossover(Strategy):
+    """Crossover of two exponential moving averages."""
+
+    name = "ema_crossover"
+
+    def __init__(self, fast: int = 12, slow: int = 26):
+        self.fast = fast
+        self.slow = slow
+
+    def signals(self, symbol, close, indicators):
+        return crossover_signals(indicators.get(symbol, "ema", (self.fast,), close),
+                                 indicators.get(symbol, "ema", (self.slow,), close))
+
+
+class RSIStrategy(Strategy):
+    """Buy when RSI climbs back above `lower` (oversold), sell when it drops back below `upper` (overbought)."""
+
+    name = "rsi"
+
+    def __init__(self, period: int = 14, lower: float = 30, upper: float = 70):
+        self.period = period
+        self.lower = lower
+        self.upper = upper
+
+    def signals(self, symbol, close, indicators):
+        values = indicators.get(symbol, "rsi", (self.period,), close)
+        signals = np.zeros(len(values), dtype=np.int8)
+        buy = (values[:-1] < self.lower) & (values[1:] >= self.lower)
+        sell = (values[:-1] > self.upper) & (values[1:] <= self.upper)
+        signals[1:] = buy.astype(np.int8) - sell.astype(np.int8)
+        return signals
+
+
+class BollingerStrategy(Strategy):
+    """Mean reversion: buy when Close closes below the lower band, sell when it closes above the upper band."""
+
+    name = "bollinger"
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.window = window
+        self.num_std = num_std
+
+    def signals(self, symbol, close, indicators):
+        lower, _, upper = indicators.get(symbol, "bollinger", (self.window, self.num_std), close)
+        close = np.asarray(close, dtype=np.float64)
+        signals = np.zeros(len(close), dtype=np.int8)
+        signals[close < lower] = 1
+        signals[close > upper] = -1
+        return signals
@@ -0,0 +1,93 @@
+import math
+from collections import deque
+
+from algo_trader import AlgoTrader
+
+
+# ------------------------------
+# O(1) rolling mean over a fixed window
+# ------------------------------
+class RollingMean:
+    """Running-sum ring buffer; value is None until the window is full (like rolling().mean() NaNs)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.total = 0.0
+        self.compensation = 0.0   # Kahan compensation keeps long streams from drifting
+
+    def _add(self, x):
+        y = x - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+    def update(self, x: float):
+        if len(self.buffer) == self.window:
+            self._add(-self.buffer[0])
+        self.buffer.append(x)
+        self._add(x)
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.buffer) < self.window:
+            return None
+        return self.total / self.window
+
+
+# ------------------------------
+# Incremental Golden Cross engine
+# ------------------------------
+class StreamingGoldenCross:
+    """Feed bars one at a time; reaches the same trades as AlgoTrader.apply_strategy.
+
+    Position, cash and profit live on the wrapped AlgoTrader and are changed through its
+    buy_stock/sell_stock methods, so evaluate_performance works as in the batch path.
+    """
+
+    def __init__(self, trader: AlgoTrader):
+        self.trader = trader
+        self.fast = RollingMean(trader.fast_window)
+        self.slow = RollingMean(trader.slow_window)
+        self.prev_fast = None
+        self.prev_slow = None
+        self.last_close = None
+
+    def on_bar(self, close: float):
+        """Process one closing price. Returns "buy", "sell" or None.
+
+        A NaN close is replaced by the last seen close (the forward-fill clean_data applies
+        in the batch path); NaNs before the first real close are skipped, as the batch
+        moving averages stay NaN over them.
+        """
+        close = float(close)
+        if math.isnan(close):
+            if self.last_close is None:
+                return None
+            close = self.last_close
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        action = None
+
+        if None not in (self.prev_fast, self.prev_slow, fast, slow):
+            # When fast MA crosses ABOVE slow MA send Golden Cross (Buy) signal
+            if self.prev_fast < self.prev_slow and fast > slow:
+                if self.trader.position == 0:
+                    self.trader.buy_stock(close, self.trader.cash)
+                    action = "buy" if self.trader.position == 1 else None
+            # When fast MA crosses BELOW slow MA send Death Cross (Sell) signal
+            elif self.prev_fast > self.prev_slow and fast < slow:
+                if self.trader.position == 1:
+                    self.trader.sell_stock(close)
+                    action = "sell"
+
+        self.prev_fast, self.prev_slow = fast, slow
+        self.last_close = close
+        return action
+
+    def close(self):
+        """Force close an open position at the last seen price (end of the batch data period)."""
+        if self.trader.position == 1 and self.last_close is not None:
+            self.trader.sell_stock(self.last_close)
+            self.trader.logger.info("Position forcefully closed at the end of data period.")
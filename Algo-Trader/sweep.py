@@ -0,0 +1,127 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from algo_trader import AlgoTrader
+from events import SILENT, EventLogger
+from price_cache import PriceCache
+from strategies import IndicatorCache, SMACrossover
+
+
+# ------------------------------
+# Worker side: attach to shared price arrays once per process
+# ------------------------------
+_attached = {}
+_indicators = IndicatorCache()   # per-process, so MAs are shared by every job on the same symbol
+
+
+def _attach(shm_name: str, length: int):
+    """Return a read-only view of a shared Close array, attaching on first use in this process."""
+    if shm_name not in _attached:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        close = np.ndarray((length,), dtype=np.float64, buffer=shm.buf)
+        close.flags.writeable = False
+        _attached[shm_name] = (shm, close)
+    return _attached[shm_name][1]
+
+
+def run_job(job):
+    """Backtest one (symbol, params) combination against a shared Close array."""
+    symbol, shm_name, length, fast_window, slow_window, budget, from_date, to_date, verbosity = job
+    close = _attach(shm_name, length)
+
+    trader = AlgoTrader(symbol, from_date, to_date, budget=budget,
+                        strategy=SMACrossover(fast_window, slow_window), indicators=_indicators,
+                        logger=EventLogger(verbosity=verbosity))
+    trader.data = pd.DataFrame({"Close": close})
+    trader.apply_strategy(engine="vectorized")
+    result = trader.evaluate_performance()
+    result["Fast Window"] = fast_window
+    result["Slow Window"] = slow_window
+    return result
+
+
+# ------------------------------
+# Parent side: load prices once, publish them, fan out jobs
+# ------------------------------
+def load_close(symbol: str, from_date: str, to_date: str, cache=None, logger=None):
+    """Download and clean one symbol and return its Close prices as a float64 array."""
+    trader = AlgoTrader(symbol, from_date, to_date, cache=cache, logger=logger)
+    trader.download_data()
+    trader.clean_data()
+    return trader.get_column_array("Close")
+
+
+def run_sweep(symbols, fast_windows, slow_windows, budgets, from_date, to_date, processes=None, cache=None,
+              verbosity=SILENT, logger=None):
+    """Backtest every symbol against the fast/slow/budget grid on a process pool.
+
+    Each symbol's Close prices are copied once into shared memory; workers attach to
+    the block by name, so only small job tuples are pickled per (symbol, params) job.
+    Workers log at `verbosity` (silent by default); the parent's loading and progress
+    messages go to `logger`. Returns one DataFrame with a row per job, ranked by ROI.
+    """
+    logger = logger if logger is not None else EventLogger()
+    params = [(fast, slow, budget)
+              for fast, slow, budget in itertools.product(fast_windows, slow_windows, budgets)
+              if fast < slow]
+
+    blocks = []
+    jobs = []
+    try:
+        for symbol in symbols:
+            close = load_close(symbol, from_date, to_date, cache=cache, logger=logger)
+            if len(close) == 0:
+                logger.info(f"No data for {symbol}, skipping.")
+                logger.emit("sweep_skip", symbol=symbol)
+                continue
+            shm = shared_memory.SharedMemory(create=True, size=close.nbytes)
+            np.ndarray(close.shape, dtype=np.float64, buffer=shm.buf)[:] = close
+            blocks.append(shm)
+            for fast, slow, budget in params:
+                jobs.append((symbol, shm.name, len(close), fast, slow, budget, from_date, to_date, verbosity))
+
+        logger.info(f"Running {len(jobs)} backtests for {len(blocks)} symbols...")
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_job, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    report = pd.DataFrame(results)
+    if not report.empty:
+        report = report.sort_values("ROI", ascending=False).reset_index(drop=True)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Golden Cross parameter sweep over many symbols")
+    parser.add_argument("symbols", nargs="+", help="Ticker symbols, e.g. AAPL MSFT")
+    parser.add_argument("--from-date", default="2018-01-01")
+    parser.add_argument("--to-date", default="2023-12-31")
+    parser.add_argument("--fast", type=int, nargs="+", default=[50], help="Fast MA windows")
+    parser.add_argument("--slow", type=int, nargs="+", default=[200], help="Slow MA windows")
+    parser.add_argument("--budget", type=float, nargs="+", default=[5000], help="Initial budgets")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", help="Optional CSV path for the ranked results")
+    parser.add_argument("--cache-dir", help="Serve prices from a local PriceCache in this directory")
+    parser.add_argument("--verbosity", type=int, default=SILENT, choices=[0, 1, 2],
+                        help="Worker output: 0 silent, 1 stages and reports, 2 every trade")
+    args = parser.parse_args()
+
+    logger = EventLogger()
+    cache = PriceCache(args.cache_dir, logger=logger) if args.cache_dir else None
+
+    report = run_sweep(args.symbols, args.fast, args.slow, args.budget,
+                       args.from_date, args.to_date, processes=args.processes, cache=cache,
+                       verbosity=args.verbosity, logger=logger)
+    print(report.to_string())
+    if args.output:
+        report.to_csv(args.output, index=False)
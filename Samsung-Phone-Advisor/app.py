@@ -1,39 +1,78 @@
 import argparse
-import re
 import time
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import or_
 from sqlalchemy.orm import Session as SQLAlchemySession
-from models import Phone, get_session
+from models import Phone, get_async_session, get_session, upsert_phones
+from catalog import PhoneCatalog
+from query_parser import BEST, COMPARE, parse_query
+from ranking import DEFAULT_WEIGHTS, PhoneRanker
+from response_cache import ANY_MODEL, MemoryBackend, ResponseCache, SQLiteBackend, cache_key
+from scrape_common import HEADERS, parse_detail_page, parse_list_entry
 from dotenv import load_dotenv
 import os
 
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI(title="Samsung Phone Advisor")
+@asynccontextmanager
+async def lifespan(app):
+    # Load the in-memory phone catalog once at startup
+    refresh_catalog()
+    yield
+
+app = FastAPI(title="Samsung Phone Advisor", lifespan=lifespan)
 
 # Get DATABASE_URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable not set. Please check your .env file.")
 
+# Connection pool tuning (unset = SQLAlchemy defaults: 5 connections + 10 overflow)
+POOL_OPTIONS = {
+    "pool_size": int(os.environ["DB_POOL_SIZE"]) if os.getenv("DB_POOL_SIZE") else None,
+    "max_overflow": int(os.environ["DB_MAX_OVERFLOW"]) if os.getenv("DB_MAX_OVERFLOW") else None,
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no"),
+}
+
 try:
-    session_maker = get_session(DATABASE_URL)
+    session_maker = get_session(DATABASE_URL, **POOL_OPTIONS)
+    # /ask runs on the async engine so queries do not block the event loop
+    async_session_maker = get_async_session(DATABASE_URL, **POOL_OPTIONS)
 except Exception as e:
     raise ValueError(f"Failed to initialize database connection: {e}")
 
-BASE_URL = "https://www.gsmarena.com/"
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-}
+# Process-local model index used by data_extractor (refreshed after scrapes and when stale)
+catalog = PhoneCatalog()
+ranker = PhoneRanker()
+
+# /ask answer cache; set RESPONSE_CACHE_PATH to share it (SQLite file) across workers and the scraper
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+response_cache = ResponseCache(
+    SQLiteBackend(RESPONSE_CACHE_PATH) if RESPONSE_CACHE_PATH
+    else MemoryBackend(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "600")),
+)
+
+MAX_BATCH_QUESTIONS = 500
 
 class Query(BaseModel):
     question: str
 
+class BatchQuery(BaseModel):
+    questions: List[str]
+
+class RankQuery(BaseModel):
+    weights: Dict[str, float] = Field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    limit: int = Field(10, ge=1, le=1000)
+    max_price: Optional[float] = None
+    models: Optional[List[str]] = None  # rank only these phones (resolved through the catalog)
+
 def fetch_page(url, retries=5, delay=5):
     for attempt in range(retries):
         try:
@@ -47,96 +86,83 @@ def fetch_page(url, retries=5, delay=5):
     print(f"Failed to fetch {url} after {retries} attempts.")
     return None
 
-def parse_title_specs(title):
-    specs = {}
-    try:
-        if "Features " in title:
-            features_part = title.split("Features ")[1]
-        else:
-            features_part = title
-        parts = [p.strip() for p in features_part.split(",")]
-        for part in parts:
-            if "display" in part.lower():
-                specs["display"] = part
-            elif "chipset" in part.lower():
-                specs["chipset"] = part
-            elif "battery" in part.lower():
-                specs["battery"] = part
-            elif "storage" in part.lower():
-                specs["storage"] = part
-            elif "ram" in part.lower():
-                specs["ram"] = part
-        date_match = re.search(r"Announced ([A-Za-z]+ \d{4})", title)
-        specs["release_date"] = date_match.group(1) if date_match else None
-        specs["camera"] = None
-        specs["price"] = None
-        return specs
-    except Exception as e:
-        print(f"Error parsing title: {e}")
-        return specs
-
-def parse_detail_page(soup):
-    specs = {}
-    try:
-        # Find all tables, fallback to all if specific classes not found
-        tables = soup.find_all("table")  # Simplified, as HTML shows no specific class
-        print(f"Found {len(tables)} tables on detail page: {soup.title.text if soup.title else 'No title'}")
-        
-        for table in tables:
-            th = table.find("th")
-            table_category = th.text.strip() if th else "Unknown"
-            rows = table.find_all("tr")
-            for row in rows:
-                cells = row.find_all("td")
-                if len(cells) >= 2:
-                    key = cells[0].text.strip()
-                    value = cells[1].text.strip()
-                    print(f"  Table '{table_category}': Key='{key}' Value='{value[:50]}...'")
-                    
-                    # Camera extraction: check key or data-spec
-                    if any(c_phrase.lower() in key.lower() for c_phrase in ["Main Camera", "Camera", "Primary camera", "Rear camera"]) or cells[1].get("data-spec") == "cam1modules":
-                        specs["camera"] = value
-                        print(f"    → Extracted camera: {value[:50]}...")
-                    
-                    # Price extraction: handle €, ₹, $, US$, and decimals
-                    if "Price" in key.lower() or cells[1].get("data-spec") == "price":
-                        price_match = re.search(r'(?:€|₹|US\$|\$)\s*([\d,]+(?:\.\d{1,2})?)', value)
-                        specs["price"] = float(price_match.group(1).replace(',', '')) if price_match else None
-                        print(f"    → Extracted price: {specs.get('price', 'None')}")
-        
-        return specs
-    except Exception as e:
-        print(f"Error parsing detail page: {e}")
-        return specs
-    
+def fetch_page_cached(url, page_cache, retries=5, delay=5):
+    """Conditional GET through a PageCache. Returns (soup, changed); an unchanged page comes from disk."""
+    for attempt in range(retries):
+        try:
+            response = requests.get(url, headers={**HEADERS, **page_cache.conditional_headers(url)}, timeout=15)
+            if response.status_code == 304:
+                print(f"Not modified: {url}")
+                return BeautifulSoup(page_cache.load(url), "html.parser"), False
+            response.raise_for_status()
+            changed = page_cache.store(url, response.text, response.headers)
+            print(f"Fetched {url} successfully on attempt {attempt + 1}{'' if changed else ' (unchanged)'}")
+            return BeautifulSoup(response.text, "html.parser"), changed
+        except requests.RequestException as e:
+            print(f"Error fetching {url}: {e}. Retrying ({attempt + 1}/{retries})...")
+            time.sleep(delay)
+    print(f"Failed to fetch {url} after {retries} attempts.")
+    return None, True
 
 def parse_phone_from_link(a_tag):
-    href = a_tag.get('href', '')
-    if not href:
+    specs = parse_list_entry(a_tag)
+    if not specs:
         return None
-    url = urljoin(BASE_URL, href)
     
-    model_span = a_tag.select_one("strong span")
-    model = model_span.text.strip() if model_span else None
+    detail_soup = fetch_page(specs["url"])
+    if detail_soup:
+        specs.update(parse_detail_page(detail_soup))
     
-    if not model:
+    return specs
+
+def parse_changed_phone_from_link(a_tag, page_cache):
+    """Like parse_phone_from_link, but returns None when the detail page has not changed since the last scrape."""
+    specs = parse_list_entry(a_tag)
+    if not specs:
         return None
     
-    specs = {"model": model}
-    
-    img = a_tag.find("img")
-    if img and img.get("title"):
-        specs.update(parse_title_specs(img['title']))
-    
-    detail_soup = fetch_page(url)
+    detail_soup, changed = fetch_page_cached(specs["url"], page_cache)
+    if not changed:
+        print(f"Unchanged: {specs['model']}, skipping parse and DB write.")
+        return None
     if detail_soup:
         specs.update(parse_detail_page(detail_soup))
     
-    specs["url"] = url
     return specs
 
-def scrape_samsung_phones(limit=25):
-    soup = fetch_page("https://www.gsmarena.com/samsung-phones-9.php")
+def save_phones(phones, batch_size=500):
+    """Persist scraped specs in batched upserts (only non-empty fields overwrite existing values)."""
+    if not phones:
+        return True
+    session = session_maker()
+    try:
+        saved = upsert_phones(session, phones, batch_size=batch_size)
+        print(f"Saved/Updated {saved} phones in {(saved + batch_size - 1) // batch_size} batch(es).")
+        response_cache.invalidate_models({p["model"] for p in phones if p.get("model")})
+    except Exception as e:
+        print(f"Error saving {len(phones)} phones: {e}")
+        session.rollback()
+        return False
+    finally:
+        session.close()
+    refresh_catalog()
+    return True
+
+def save_and_commit(phones, page_cache=None, batch_size=500):
+    """save_phones, then mark the phones' detail pages as cached only if the write succeeded."""
+    if not save_phones(phones, batch_size):
+        return False
+    if page_cache is not None:
+        page_cache.commit(p["url"] for p in phones if p.get("url"))
+    return True
+
+def scrape_samsung_phones(limit=25, page_cache=None, batch_size=100):
+    list_url = "https://www.gsmarena.com/samsung-phones-9.php"
+    if page_cache is None:
+        soup = fetch_page(list_url)
+    else:
+        soup = fetch_page_cached(list_url, page_cache)[0]
+        page_cache.commit([list_url])
     if not soup:
         print("Failed to fetch GSMArena page.")
         return
@@ -147,7 +173,7 @@ def scrape_samsung_phones(limit=25):
         return
     
     links = makers_div.find_all("a", href=True)
-    session = session_maker()
+    pending = []
     
     for i, a_tag in enumerate(links[:limit]):
         if 'galaxy' not in a_tag.get('href', '').lower():
@@ -155,40 +181,152 @@ def scrape_samsung_phones(limit=25):
         phone_model = a_tag.select_one("strong span").text.strip() if a_tag.select_one("strong span") else "Unknown"
         print(f"Processing {i+1}/{len(links[:limit])}: {phone_model}")
         
-        phone_specs = parse_phone_from_link(a_tag)  # Assuming parse_phone_from_link was a typo
+        if page_cache is None:
+            phone_specs = parse_phone_from_link(a_tag)  # Assuming parse_phone_from_link was a typo
+        else:
+            phone_specs = parse_changed_phone_from_link(a_tag, page_cache)
         if phone_specs and phone_specs.get("model"):
-            existing = session.query(Phone).filter_by(model=phone_specs["model"]).first()
-            if existing:
-                for key, value in phone_specs.items():
-                    if key in ["release_date", "display", "battery", "camera", "ram", "storage"] and value:
-                        setattr(existing, key, value)
-                if phone_specs.get("price") is not None:  # Explicit None check
-                    existing.price = phone_specs["price"]
-            else:
-                new_phone = Phone(**{k: v for k, v in phone_specs.items() if k in Phone.__table__.columns.keys()})
-                session.add(new_phone)
-            try:
-                session.commit()
-                print(f"Saved/Updated {phone_specs['model']} - Camera: {phone_specs.get('camera', 'None')}, Price: {phone_specs.get('price', 'None')}")
-            except Exception as e:
-                print(f"Error saving {phone_specs['model']}: {e}")
-                session.rollback()
+            pending.append(phone_specs)
+            if len(pending) >= batch_size:
+                save_and_commit(pending, page_cache, batch_size)
+                pending = []
         time.sleep(5)  # Increased delay
     
-    session.close()
+    save_and_commit(pending, page_cache, batch_size)
+    if page_cache is not None:
+        page_cache.save()
+
+def phone_to_dict(phone):
+    return {
+        "model": phone.model,
+        "release_date": phone.release_date,
+        "display": phone.display,
+        "battery": phone.battery,
+        "camera": phone.camera if phone.camera else "Unknown",
+        "ram": phone.ram,
+        "storage": phone.storage,
+        "price": phone.price if phone.price is not None else "Unknown",
+        "battery_mah": phone.battery_mah,
+        "main_camera_mp": phone.main_camera_mp,
+        "display_inches": phone.display_inches,
+        "ram_gb": phone.ram_gb,
+        "storage_gb": phone.storage_gb,
+        "released_on": phone.released_on,
+    }
+
+# "best <criterion>" -> (indexed column, order); price ranks cheapest first
+BEST_ORDER = {
+    "battery": (Phone.battery_mah, Phone.battery_mah.desc()),
+    "camera": (Phone.main_camera_mp, Phone.main_camera_mp.desc()),
+    "display": (Phone.display_inches, Phone.display_inches.desc()),
+    "price": (Phone.price, Phone.price.asc()),
+}
+
+def best_phones(session: SQLAlchemySession, criterion, max_price=None, limit=5):
+    """Phones (priced under max_price, if given) ranked by one criterion, as one indexed SQL query."""
+    column, order = BEST_ORDER[criterion]
+    query = session.query(Phone).filter(column.isnot(None))
+    if max_price is not None:
+        query = query.filter(Phone.price < max_price)
+    return [phone_to_dict(phone) for phone in query.order_by(order).limit(limit).all()]
+
+def refresh_catalog(session: SQLAlchemySession = None):
+    """Reload the in-memory catalog from the phones table; cached answers for changed rows are dropped."""
+    own_session = session is None
+    session = session or session_maker()
+    try:
+        was_loaded = len(catalog) > 0
+        phones = [phone_to_dict(phone) for phone in session.query(Phone).all()]
+        changed = catalog.load(phones)
+        ranker.load(phones)
+        if was_loaded and changed:
+            response_cache.invalidate_models(changed)
+    except Exception as e:
+        print(f"Failed to load phone catalog: {e}")
+        catalog.postpone_reload()
+    finally:
+        if own_session:
+            session.close()
+
+def lookup_models(session: SQLAlchemySession, terms):
+    """Resolve many model names with one query; same ILIKE matching as data_extractor. Returns {term: phone dict}."""
+    patterns = {}
+    for term in terms:
+        full_model = f"Galaxy {term}" if not term.startswith("Galaxy") else term
+        short_model = term.replace("Galaxy ", "") if term.startswith("Galaxy ") else term
+        patterns[term] = (full_model.lower(), short_model.lower())
+    if not patterns:
+        return {}
+    rows = (session.query(Phone)
+            .filter(or_(*[Phone.model.ilike(f"%{p}%") for pair in patterns.values() for p in pair]))
+            .all())
+    resolved = {}
+    for term, (full_model, short_model) in patterns.items():
+        phone = next((row for row in rows if full_model in row.model.lower() or short_model in row.model.lower()), None)
+        if phone:
+            resolved[term] = phone_to_dict(phone)
+    return resolved
+
+def batch_extractor(questions, session: SQLAlchemySession):
+    """data_extractor for many questions at once: every model is resolved in one pass
+    (catalog, or a single query when it is empty) and each distinct ranking runs once."""
+    parsed = {question: parse_query(question) for question in questions}
+    all_terms = {term for query in parsed.values() for term in query.models}
+    if len(catalog):
+        resolved = {term: catalog.lookup(term) for term in all_terms}
+    else:
+        resolved = lookup_models(session, all_terms)
+    print(f"Resolved {sum(1 for p in resolved.values() if p)}/{len(all_terms)} models for {len(questions)} questions.")
+
+    rankings = {}
+    results = []
+    for question in questions:
+        query = parsed[question]
+        if query.intent == BEST:
+            ranking = (query.criteria[0], query.max_price)
+            if ranking not in rankings:
+                rankings[ranking] = best_phones(session, *ranking)
+            results.append(rankings[ranking])
+            continue
+        phones = []
+        for term in query.models:
+            phone = resolved.get(term)
+            if phone and phone["model"] not in [p["model"] for p in phones]:
+                phones.append(dict(phone))
+        results.append(phones)
+    return results
+
+def catalog_phones(models):
+    """Resolve model mentions against the in-memory catalog: no DB round-trip, fuzzy ranking."""
+    phones = []
+    for model in models:
+        phone = catalog.lookup(model)
+        if phone and phone["model"] not in [p["model"] for p in phones]:
+            phones.append(dict(phone))
+            print(f"Found phone: {phone['model']}")
+        elif not phone:
+            print(f"No match for model: '{model}'")
+    return phones
 
 # Agent 1: Data Extractor (RAG-like retrieval)
 def data_extractor(question: str, session: SQLAlchemySession):
-    # Extract model names (e.g., "M36", "F56", "S25 FE")
-    models = re.findall(r'(?:Samsung\s)?(?:Galaxy\s)?([A-Z]\d+(?:\s\w+)?)(?=\s+(?:and|or|vs)|$)', question, re.IGNORECASE)
-    models = [m.strip() for m in models if m.strip()]
+    query = parse_query(question)
+    if query.intent == BEST:
+        phones = best_phones(session, query.criteria[0], query.max_price)
+        ceiling = f" under ${query.max_price:g}" if query.max_price is not None else ""
+        print(f"Found {len(phones)} phones{ceiling} with {query.criteria[0]} data.")
+        return phones
     
+    models = list(query.models)
     print(f"Extracted models from query: {models}")
     
     if not models:
         print("No models extracted. Returning empty result.")
         return []
     
+    if len(catalog):
+        return catalog_phones(models)
+    
     phones = []
     for model in models:
         # Construct possible model variations
@@ -201,49 +339,31 @@ def data_extractor(question: str, session: SQLAlchemySession):
                  .filter(Phone.model.ilike(f"%{full_model}%") | Phone.model.ilike(f"%{short_model}%"))
                  .first())
         if phone:
-            phones.append({
-                "model": phone.model,
-                "release_date": phone.release_date,
-                "display": phone.display,
-                "battery": phone.battery,
-                "camera": phone.camera if phone.camera else "Unknown",
-                "ram": phone.ram,
-                "storage": phone.storage,
-                "price": phone.price if phone.price is not None else "Unknown"
-            })
+            phones.append(phone_to_dict(phone))
             print(f"Found phone: {phone.model}")
         else:
             print(f"No match for model: full='{full_model}', short='{short_model}'")
     
-    if len(phones) < 2 and "compare" in question.lower():
+    if len(phones) < 2 and query.intent == COMPARE:
         print("Less than 2 phones found. Attempting broader search.")
         # Broader search for any relevant models
-        all_phones = session.query(Phone).all()
         for term in models:
             if len(phones) >= 2:
                 break
             phone = session.query(Phone).filter(Phone.model.ilike(f"%{term}%")).first()
             if phone and phone.model not in [p["model"] for p in phones]:
-                phones.append({
-                    "model": phone.model,
-                    "release_date": phone.release_date,
-                    "display": phone.display,
-                    "battery": phone.battery,
-                    "camera": phone.camera if phone.camera else "Unknown",
-                    "ram": phone.ram,
-                    "storage": phone.storage,
-                    "price": phone.price if phone.price is not None else "Unknown"
-                })
+                phones.append(phone_to_dict(phone))
                 print(f"Broad search found: {phone.model}")
     
     return phones
 
 # Agent 2: Review Generator
-def review_generator(phones, question: str):
+def review_generator(phones, question: str, query=None):
     if not phones:
         return "No data available for the requested phones."
     
-    if "compare" in question.lower():
+    query = query or parse_query(question)
+    if query.intent == COMPARE:
         if len(phones) < 2:
             return "Please specify two phones for comparison."
         p1, p2 = phones[0], phones[1]
@@ -251,9 +371,9 @@ def review_generator(phones, question: str):
         
         # Camera comparison
         if p1['camera'] != "Unknown" and p2['camera'] != "Unknown":
-            # Clean newlines and extract main camera MP
-            mp1 = int(re.search(r'(\d+)\s*MP', p1['camera'].replace('\r\n', ' ')).group(1)) if re.search(r'(\d+)\s*MP', p1['camera'].replace('\r\n', ' ')) else 0
-            mp2 = int(re.search(r'(\d+)\s*MP', p2['camera'].replace('\r\n', ' ')).group(1)) if re.search(r'(\d+)\s*MP', p2['camera'].replace('\r\n', ' ')) else 0
+            # Main camera MP parsed at ingest time
+            mp1 = p1['main_camera_mp'] or 0
+            mp2 = p2['main_camera_mp'] or 0
             if mp1 > mp2:
                 comparison += f"- {p1['model']} has a better main camera ({mp1}MP vs {mp2}MP).\n"
             elif mp2 > mp1:
@@ -273,8 +393,8 @@ def review_generator(phones, question: str):
         
         # Battery comparison
         if p1['battery'] and p2['battery']:
-            mah1 = int(re.search(r'(\d+)\s*mAh', p1['battery']).group(1)) if re.search(r'(\d+)\s*mAh', p1['battery']) else 0
-            mah2 = int(re.search(r'(\d+)\s*mAh', p2['battery']).group(1)) if re.search(r'(\d+)\s*mAh', p2['battery']) else 0
+            mah1 = p1['battery_mah'] or 0
+            mah2 = p2['battery_mah'] or 0
             if mah1 > mah2:
                 comparison += f"- {p1['model']} has better battery life ({mah1}mAh vs {mah2}mAh).\n"
             elif mah2 > mah1:
@@ -284,8 +404,8 @@ def review_generator(phones, question: str):
         
         # Display comparison
         if p1['display'] and p2['display']:
-            size1 = float(re.search(r'(\d+\.?\d?)″', p1['display']).group(1)) if re.search(r'(\d+\.?\d?)″', p1['display']) else 0
-            size2 = float(re.search(r'(\d+\.?\d?)″', p2['display']).group(1)) if re.search(r'(\d+\.?\d?)″', p2['display']) else 0
+            size1 = p1['display_inches'] or 0
+            size2 = p2['display_inches'] or 0
             if size1 > size2:
                 comparison += f"- {p1['model']} has a larger display ({size1}″ vs {size2}″).\n"
             elif size2 > size1:
@@ -309,47 +429,140 @@ def review_generator(phones, question: str):
             comparison += f"- Price details unavailable for comparison.\n"
         
         # Recommendation based on release date
-        if p1['release_date'] and p2['release_date']:
-            from datetime import datetime
-            try:
-                date1 = datetime.strptime(p1['release_date'], "%b %Y")
-                date2 = datetime.strptime(p2['release_date'], "%b %Y")
-                if date1 > date2:
-                    comparison += f"Overall, {p1['model']} is recommended as it is newer ({p1['release_date']} vs {p2['release_date']})."
-                else:
-                    comparison += f"Overall, {p2['model']} is recommended as it is newer ({p2['release_date']} vs {p1['release_date']})."
-            except ValueError:
-                comparison += f"Overall, both models are comparable."
+        if p1['released_on'] and p2['released_on']:
+            if p1['released_on'] > p2['released_on']:
+                comparison += f"Overall, {p1['model']} is recommended as it is newer ({p1['release_date']} vs {p2['release_date']})."
+            else:
+                comparison += f"Overall, {p2['model']} is recommended as it is newer ({p2['release_date']} vs {p1['release_date']})."
         else:
             comparison += f"Overall, both models are comparable."
         
         return comparison
-    elif "best battery under $1000" in question.lower():
-        under_1000 = [p for p in phones if p['price'] != "Unknown" and p['price'] < 1000]
-        if under_1000:
-            best = max(under_1000, key=lambda p: int(re.search(r'(\d+)\s*mAh', p['battery']).group(1)) if re.search(r'(\d+)\s*mAh', p['battery']) else 0)
-            return f"The {best['model']} has the best battery ({best['battery']}) under $1000."
-        return "No phones under $1000 found or price data unavailable."
+    elif query.intent == BEST:
+        # phones arrive ranked by best_phones; the first one that fits the ceiling wins
+        criterion = query.criteria[0]
+        ceiling = f" under ${query.max_price:g}" if query.max_price is not None else ""
+        candidates = [p for p in phones if query.max_price is None or (p['price'] != "Unknown" and p['price'] < query.max_price)]
+        if candidates:
+            best = candidates[0]
+            value = {"battery": best['battery'], "camera": f"{best['main_camera_mp']}MP",
+                     "display": best['display'], "price": f"${best['price']}"}[criterion]
+            return f"The {best['model']} has the best {criterion} ({value}){ceiling}."
+        if ceiling:
+            return f"No phones{ceiling} found or price data unavailable."
+        return f"No phones with {criterion} data found."
     else:
         if not phones:
             return "No phone data available."
         p = phones[0]
         return f"{p['model']} specs: Display: {p['display']}, Battery: {p['battery']}, Camera: {p['camera']}, RAM: {p['ram']}, Storage: {p['storage']}, Price: ${p['price']}, Released: {p['release_date']}."    
+def answer_key(query, phones=()):
+    """(cache key, models the answer depends on) for a parsed question.
+
+    A ranking is keyed on the question alone, so it can be looked up before best_phones
+    runs; it depends on every row, so any scraper update invalidates it (ANY_MODEL).
+    """
+    if query.intent == BEST:
+        return cache_key(query.cache_intent(), []), [ANY_MODEL]
+    used = phones[:2] if query.intent == COMPARE else phones[:1]  # phones the answer is built from
+    models = [p["model"] for p in used]
+    return cache_key(query.intent, models), models
+
+def answer_from_memory(question: str):
+    """(answer, phones) from the answer cache and the catalog alone, without a DB session.
+
+    answer is None on a cache miss; phones is None when the DB still has to be queried
+    (an uncached ranking, or compare/specs while the catalog is empty).
+    """
+    query = parse_query(question)
+    if query.intent == BEST:
+        return response_cache.get(answer_key(query)[0]), None
+    if not len(catalog):
+        return None, None
+    phones = catalog_phones(query.models)
+    if not phones:
+        return review_generator(phones, question, query), phones
+    return response_cache.get(answer_key(query, phones)[0]), phones
+
+def review_and_cache(phones, question: str):
+    """review_generator for an answer that missed the cache; stores it under answer_key."""
+    query = parse_query(question)
+    answer = review_generator(phones, question, query)
+    if phones or query.intent == BEST:
+        key, models = answer_key(query, phones)
+        response_cache.set(key, answer, models)
+    return answer
+
 # Unified Response
-def compose_response(question: str):
-    session = session_maker()  # Correctly instantiate a new session
-    try:
-        phones = data_extractor(question, session)
-        answer = review_generator(phones, question)
-    finally:
-        session.close()
+async def compose_response_async(question: str):
+    """Answer one question on the async engine.
+
+    The answer cache and catalog are checked first, so a cached answer opens no session.
+    Otherwise run_sync drives the same ORM code through the AsyncSession, so every query
+    awaits the driver (asyncpg/aiosqlite) instead of blocking the event loop.
+    """
+    if catalog.is_stale():
+        async with async_session_maker() as session:
+            await session.run_sync(refresh_catalog)
+    answer, phones = answer_from_memory(question)
+    if answer is None and phones is None:
+        async with async_session_maker() as session:
+            phones = await session.run_sync(lambda sync_session: data_extractor(question, sync_session))
+    if answer is None:
+        answer = review_and_cache(phones, question)
     return {"answer": answer}
 
 @app.post("/ask")
 async def ask(query: Query):
     if not query.question:
         raise HTTPException(status_code=400, detail="Question is required.")
-    return compose_response(query.question)
+    return await compose_response_async(query.question)
+
+@app.post("/ask/batch")
+async def ask_batch(query: BatchQuery):
+    if not query.questions:
+        raise HTTPException(status_code=400, detail="At least one question is required.")
+    if len(query.questions) > MAX_BATCH_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUESTIONS} questions per batch.")
+    if catalog.is_stale():
+        async with async_session_maker() as session:
+            await session.run_sync(refresh_catalog)
+    found = [answer_from_memory(question) for question in query.questions]
+    # Only the questions the cache and catalog could not answer go to the DB, in one pass
+    pending = [question for question, (answer, phones) in zip(query.questions, found) if answer is None and phones is None]
+    fetched = {}
+    if pending:
+        async with async_session_maker() as session:
+            results = await session.run_sync(lambda sync_session: batch_extractor(pending, sync_session))
+        fetched = dict(zip(pending, results))
+    answers = []
+    for question, (answer, phones) in zip(query.questions, found):
+        if answer is None:
+            answer = review_and_cache(fetched[question] if phones is None else phones, question)
+        answers.append(answer)
+    return {"answers": answers}
+
+@app.post("/rank")
+async def rank(query: RankQuery):
+    if catalog.is_stale():
+        async with async_session_maker() as session:
+            await session.run_sync(refresh_catalog)
+    models = None
+    if query.models is not None:
+        models = [phone["model"] for phone in map(catalog.lookup, query.models) if phone]
+    try:
+        ranked = ranker.rank(query.weights, limit=query.limit, max_price=query.max_price, models=models)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    fields = ["battery_mah", "main_camera_mp", "display_inches", "price", "release_date"]
+    return {
+        "weights": query.weights,
+        "results": [{"model": p["model"], "score": round(score, 4), **{f: p[f] for f in fields}} for score, p in ranked],
+    }
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return response_cache.stats()
 
 @app.get("/")
 async def root():
@@ -358,10 +571,29 @@ async def root():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--scrape", action="store_true", help="Run scraper to populate DB")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use the concurrent asyncio/httpx scraper")
+    parser.add_argument("--limit", type=int, default=25, help="Max phones to scrape (async: 0 = no limit)")
+    parser.add_argument("--all-pages", action="store_true", help="Async: follow list-page pagination")
+    parser.add_argument("--concurrency", type=int, default=4, help="Async: max concurrent requests")
+    parser.add_argument("--rate", type=float, default=1.0, help="Async: max requests per second")
+    parser.add_argument("--parse-processes", type=int, default=0, help="Async: parse detail pages on N worker processes")
+    parser.add_argument("--page-cache", metavar="DIR", help="Conditional-GET page cache dir; unchanged pages are skipped")
     args = parser.parse_args()
-    if args.scrape:
+    page_cache = None
+    if args.page_cache:
+        from page_cache import PageCache
+        page_cache = PageCache(args.page_cache)
+    if args.scrape and args.use_async:
+        import asyncio
+        from async_scraper import scrape_samsung_phones_async
+        print("Scraping Samsung phones (async)...")
+        asyncio.run(scrape_samsung_phones_async(limit=args.limit or None, all_pages=args.all_pages,
+                                                concurrency=args.concurrency, rate=args.rate,
+                                                page_cache=page_cache, parse_processes=args.parse_processes,
+                                                save=save_and_commit))
+    elif args.scrape:
         print("Scraping Samsung phones...")
-        scrape_samsung_phones(limit=25)
+        scrape_samsung_phones(limit=args.limit, page_cache=page_cache)
     else:
         import uvicorn
         uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
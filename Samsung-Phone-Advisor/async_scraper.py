@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+
+import httpx
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from fast_parser import parse_detail_html
+from scrape_common import BASE_URL, HEADERS, parse_list_entry
+
+LIST_URL = urljoin(BASE_URL, "samsung-phones-9.php")
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def retry_after_seconds(response):
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def fetch_response(client, url, limiter, retries=5, base_delay=1.0, max_delay=60.0, headers=None):
+    """GET a page through the rate limiter, retrying with exponential backoff (Retry-After wins).
+
+    Returns the successful (2xx or 304) response, or None.
+    """
+    for attempt in range(retries):
+        await limiter.acquire()
+        response = None
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 304:
+                return response
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                print(f"Fetched {url} successfully on attempt {attempt + 1}")
+                return response
+            error = f"HTTP {response.status_code}"
+        except httpx.HTTPStatusError as e:
+            # Non-retryable status (e.g. 404): give up on this URL
+            print(f"Error fetching {url}: {e}")
+            return None
+        except httpx.HTTPError as e:
+            error = str(e) or type(e).__name__
+
+        delay = retry_after_seconds(response)
+        if delay is None:
+            delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+        print(f"Error fetching {url}: {error}. Retrying in {delay:.1f}s ({attempt + 1}/{retries})...")
+        await asyncio.sleep(delay)
+    print(f"Failed to fetch {url} after {retries} attempts.")
+    return None
+
+
+async def fetch_html(client, url, limiter, retries=5):
+    response = await fetch_response(client, url, limiter, retries=retries)
+    return response.text if response is not None else None
+
+
+async def fetch_html_cached(client, url, limiter, page_cache, retries=5):
+    """Conditional GET through a PageCache. Returns (html, changed); an unchanged page comes from disk."""
+    response = await fetch_response(client, url, limiter, retries=retries,
+                                    headers=page_cache.conditional_headers(url))
+    if response is None:
+        return None, True
+    if response.status_code == 304:
+        print(f"Not modified: {url}")
+        return page_cache.load(url), False
+    return response.text, page_cache.store(url, response.text, response.headers)
+
+
+def list_page_links(soup):
+    """Phone links from a maker list page (same 'galaxy' filter as the sync scraper)."""
+    makers_div = soup.select_one("div.makers")
+    if not makers_div:
+        return []
+    return [a for a in makers_div.find_all("a", href=True) if 'galaxy' in a.get('href', '').lower()]
+
+
+def pagination_urls(soup, page_url):
+    """Absolute URLs of the other list pages linked from div.nav-pages."""
+    nav = soup.select_one("div.nav-pages")
+    if not nav:
+        return []
+    return [urljoin(page_url, a["href"]) for a in nav.find_all("a", href=True)]
+
+
+async def scrape_list_pages(client, limiter, list_url, all_pages, page_cache=None):
+    """Fetch the first list page and, if all_pages, every page reachable through pagination."""
+    async def fetch(url):
+        if page_cache is None:
+            return await fetch_html(client, url, limiter)
+        html = (await fetch_html_cached(client, url, limiter, page_cache))[0]
+        page_cache.commit([url])   # list pages are always re-parsed; nothing to persist first
+        return html
+
+    entries = []
+    seen = {list_url}
+    queue = [list_url]
+    while queue:
+        pages = await asyncio.gather(*(fetch(url) for url in queue))
+        next_queue = []
+        for url, html in zip(queue, pages):
+            if not html:
+                print(f"Failed to fetch list page {url}.")
+                continue
+            soup = BeautifulSoup(html, "html.parser")
+            entries.extend((url, a) for a in list_page_links(soup))
+            if all_pages:
+                for page in pagination_urls(soup, url):
+                    if page not in seen:
+                        seen.add(page)
+                        next_queue.append(page)
+        queue = next_queue
+    return entries
+
+
+async def scrape_samsung_phones_async(limit=25, list_url=LIST_URL, all_pages=False,
+                                      concurrency=4, rate=1.0, retries=5, page_cache=None, parse_processes=0,
+                                      save=None):
+    """Concurrent scraper: pooled httpx client, bounded concurrency and a token-bucket rate limit.
+
+    With a PageCache, detail pages that have not changed since the last run are skipped
+    (no parse, no DB write). Detail pages are parsed with the lxml fast parser, on a pool of
+    `parse_processes` worker processes when > 0. The scraped spec dicts are passed to
+    `save(phones, page_cache)`, which writes them and commits their pages to the cache (app.py
+    passes save_and_commit); without it nothing is written or committed. Returns the phones.
+    """
+    limiter = TokenBucket(rate, capacity=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    parse_pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes else None
+    loop = asyncio.get_running_loop()
+
+    async with httpx.AsyncClient(headers=HEADERS, timeout=15, limits=limits, follow_redirects=True) as client:
+        entries = await scrape_list_pages(client, limiter, list_url, all_pages, page_cache)
+        if limit:
+            entries = entries[:limit]
+        print(f"Found {len(entries)} phones to scrape.")
+
+        async def scrape_one(page_url, a_tag):
+            specs = parse_list_entry(a_tag, base_url=page_url)
+            if not specs:
+                return None
+            async with semaphore:
+                if page_cache is None:
+                    html = await fetch_html(client, specs["url"], limiter, retries=retries)
+                else:
+                    html, changed = await fetch_html_cached(client, specs["url"], limiter, page_cache, retries=retries)
+                    if not changed:
+                        print(f"Unchanged: {specs['model']}, skipping parse and DB write.")
+                        return None
+            if html:
+                if parse_pool is None:
+                    specs.update(parse_detail_html(html))
+                else:
+                    specs.update(await loop.run_in_executor(parse_pool, parse_detail_html, html))
+            return specs
+
+        try:
+            results = await asyncio.gather(*(scrape_one(url, a) for url, a in entries))
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+
+    phones = [specs for specs in results if specs and specs.get("model")]
+    # Changed pages only enter the page cache once their rows are in the database
+    if save is not None:
+        save(phones, page_cache)
+    if page_cache is not None:
+        page_cache.save()
+    return phones
@@ -0,0 +1,177 @@
+"""Latency/throughput benchmark for /ask on a seeded local SQLite database.
+
+Usage:
+    python bench_api.py --phones 5000 --requests 2000 --concurrency 16
+    python bench_api.py --max-p95-ms 50      # exit non-zero when p95 latency exceeds 50 ms
+Seeds synthetic phones, then drives /ask in-process (httpx.ASGITransport, no server or
+network) with a mix of compare, spec and filter questions. Reports p50/p95/p99 latency,
+requests/sec and time spent in catalog_phones, data_extractor and review_generator.
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+SUFFIXES = ["", " 5G", " FE", " Plus", " Ultra", " Lite"]
+
+
+def synthetic_phones(n, seed=0):
+    """n phone spec dicts shaped like scraped ones ('Galaxy M36 5G', '5000 mAh battery', ...)."""
+    rng = random.Random(seed)
+    names = (f"Galaxy {series}{number}{suffix}"
+             for number in range(1, 1000) for series in "AMFSZ" for suffix in SUFFIXES)
+    phones = []
+    for model in itertools.islice(names, n):
+        phones.append({
+            "model": model,
+            "release_date": f"{rng.choice(MONTHS)} {rng.randint(2019, 2025)}",
+            "display": f"{rng.choice([6.1, 6.4, 6.5, 6.6, 6.7, 6.74, 6.8, 6.9])}″ display",
+            "battery": f"{rng.choice([4000, 4500, 4900, 5000, 6000, 7000])} mAh battery",
+            "camera": f"{rng.choice([12, 50, 64, 108, 200])} MP, f/1.8, (wide), PDAF\r\n"
+                      f"{rng.choice([2, 5, 8, 12])} MP, f/2.2, ({rng.choice(['ultrawide', 'macro'])})",
+            "ram": f"{rng.choice([4, 6, 8, 12, 16])} GB RAM",
+            "storage": f"{rng.choice([64, 128, 256, 512, 1024])} GB storage",
+            "price": rng.choice([None, rng.randint(100, 1600)]),
+        })
+    return phones
+
+
+def question_mix(phones, n, seed=0, compare=0.5, specs=0.35):
+    """n questions; popular models are asked about far more often (Zipf-like), like real traffic."""
+    rng = random.Random(seed)
+    models = [p["model"].replace("Galaxy ", "") for p in phones]
+    weights = [1 / (rank + 1) for rank in range(len(models))]
+    questions = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < compare:
+            a, b = rng.choices(models, weights, k=2)
+            questions.append(f"Compare Samsung Galaxy {a} and {b}")
+        elif roll < compare + specs:
+            questions.append(f"Tell me about Samsung Galaxy {rng.choices(models, weights)[0]}")
+        else:
+            questions.append("Best battery under $1000")
+    return questions
+
+
+def timed(func, samples):
+    """Wrap a pipeline stage so each call's duration is appended to samples."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))]
+
+
+def summarize(samples):
+    values = sorted(samples)
+    return {
+        "calls": len(values),
+        "mean_ms": round(1000 * sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(1000 * percentile(values, 50), 3),
+        "p95_ms": round(1000 * percentile(values, 95), 3),
+        "p99_ms": round(1000 * percentile(values, 99), 3),
+    }
+
+
+async def drive(app, questions, concurrency):
+    """Send every question through the ASGI app from `concurrency` workers; returns (latencies, errors, seconds)."""
+    latencies, errors = [], 0
+    queue = iter(questions)
+
+    async def worker(client):
+        nonlocal errors
+        for question in queue:
+            start = time.perf_counter()
+            response = await client.post("/ask", json={"question": question})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def main(args):
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench_api_"), "phones.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    if not args.cache:
+        os.environ["RESPONSE_CACHE_TTL"] = "0"   # measure the full pipeline on every request
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        from models import upsert_phones
+
+        phones = synthetic_phones(args.phones, seed=args.seed)
+        session = app.session_maker()
+        try:
+            upsert_phones(session, phones, batch_size=500)
+        finally:
+            session.close()
+        app.refresh_catalog()
+
+    questions = question_mix(phones, args.requests, seed=args.seed)
+    stages = {"catalog_phones": [], "data_extractor": [], "review_generator": []}
+    for name, samples in stages.items():
+        setattr(app, name, timed(getattr(app, name), samples))
+
+    # Warm-up (imports, first connections) is excluded from the numbers
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(drive(app.app, questions[:min(50, len(questions))], args.concurrency))
+        for samples in stages.values():
+            samples.clear()
+        latencies, errors, elapsed = asyncio.run(drive(app.app, questions, args.concurrency))
+
+    latency = summarize(latencies)
+    report = {
+        "phones": len(phones),
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {k: latency[k] for k in ["mean_ms", "p50_ms", "p95_ms", "p99_ms"]},
+        "stages": {name: summarize(samples) for name, samples in stages.items()},
+        "response_cache": app.response_cache.stats(),
+    }
+    print(json.dumps(report, indent=2))
+
+    if errors:
+        sys.exit(f"{errors} requests failed.")
+    if args.max_p95_ms is not None and latency["p95_ms"] > args.max_p95_ms:
+        sys.exit(f"p95 latency {latency['p95_ms']} ms exceeds the {args.max_p95_ms} ms budget.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--phones", type=int, default=5000, help="Synthetic phones to seed")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="SQLite file to seed (default: a fresh temp file)")
+    parser.add_argument("--cache", action="store_true", help="Keep the /ask answer cache enabled")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if p95 latency exceeds this")
+    main(parser.parse_args())
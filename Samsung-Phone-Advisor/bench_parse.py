@@ -0,0 +1,85 @@
+"""Benchmark parse_detail_page against the lxml fast parser on saved detail pages.
+
+Usage:
+    python bench_parse.py --fixtures saved_pages/ --repeat 5
+Without --fixtures a synthetic GSMArena-like page is used. Exits non-zero if the two
+parsers extract different specs for any page.
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from fast_parser import parse_detail_html, parse_detail_pages
+from scrape_common import parse_detail_page
+
+
+def synthetic_page(i=0):
+    """Detail page shaped like GSMArena's spec sheet (13 tables, camera + price rows)."""
+    tables = []
+    for t, category in enumerate(["Network", "Launch", "Body", "Display", "Platform", "Memory",
+                                  "Main Camera", "Selfie camera", "Sound", "Comms", "Features", "Battery", "Misc"]):
+        rows = []
+        for r in range(5):
+            spec = ""
+            value = f"{category} value {r} for phone {i} " * 3
+            if category == "Main Camera" and r == 0:
+                spec, value = "cam1modules", f"50 MP, f/1.8, (wide), PDAF, OIS\r\n8 MP, f/2.2, (ultrawide)\r\n2 MP, f/2.4, (macro) {i}"
+            elif category == "Misc" and r == 1:
+                spec, value = "price", f"€ {200 + i}.99 / ₹ 13,999"
+            spec_attr = f' data-spec="{spec}"' if spec else ""
+            head = f'<th rowspan="5" scope="row">{category}</th>' if r == 0 else ""
+            rows.append(f'<tr>{head}<td class="ttl"><a href="#">Key {r}</a></td><td class="nfo"{spec_attr}>{value}</td></tr>')
+        tables.append(f'<table cellspacing="0">{"".join(rows)}</table>')
+    return (f"<html><head><title>Samsung Galaxy Test {i} - Full phone specifications</title></head><body>"
+            f"<div id='specs-list'>{''.join(tables)}</div></body></html>")
+
+
+def bench(func, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(html) for html in pages]
+    return results, len(pages) * repeat / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="Directory of saved detail pages (*.html)")
+    parser.add_argument("--synthetic", type=int, default=200, help="Synthetic pages when no fixtures are given")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=None, help="Also time the process-pool fast path")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.fixtures, "*.html"))):
+            with open(path, encoding="utf-8", newline="") as f:
+                pages.append(f.read())
+    else:
+        pages = [synthetic_page(i) for i in range(args.synthetic)]
+    if not pages:
+        sys.exit("No pages to benchmark.")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        baseline, baseline_rate = bench(lambda html: parse_detail_page(BeautifulSoup(html, "html.parser")), pages, args.repeat)
+    fast, fast_rate = bench(parse_detail_html, pages, args.repeat)
+
+    report = {
+        "pages": len(pages),
+        "baseline_pages_per_sec": round(baseline_rate, 1),
+        "fast_pages_per_sec": round(fast_rate, 1),
+        "speedup": round(fast_rate / baseline_rate, 2),
+        "identical": baseline == fast,
+    }
+    if args.processes:
+        start = time.perf_counter()
+        pooled = parse_detail_pages(pages * args.repeat, processes=args.processes)
+        report["pool_pages_per_sec"] = round(len(pooled) / (time.perf_counter() - start), 1)
+        report["identical"] = report["identical"] and pooled[:len(pages)] == fast
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["identical"] else 1)
@@ -0,0 +1,73 @@
+"""Microbenchmark and corpus check for query_parser.parse_query.
+
+Usage:
+    python bench_query.py --corpus query_corpus.json --repeat 2000
+Checks every corpus question against its expected intent/models/max_price/criteria (exit
+non-zero on a mismatch), then times the per-request question handling the baseline request path
+did (uncompiled regex plus lower() substring checks) against parse_query,
+both uncached and with its LRU cache.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+from query_parser import parse_query
+
+
+def legacy_parse(question):
+    """The question handling one /ask request did in the baseline data_extractor and review_generator.
+
+    The broader-search "compare" check in data_extractor only ran when fewer than two phones
+    were found, so it is left out.
+    """
+    models = re.findall(r'(?:Samsung\s)?(?:Galaxy\s)?([A-Z]\d+(?:\s\w+)?)(?=\s+(?:and|or|vs)|$)', question, re.IGNORECASE)
+    models = [m.strip() for m in models if m.strip()]                 # data_extractor
+    compare = "compare" in question.lower()                            # review_generator
+    best = not compare and "best battery under $1000" in question.lower()
+    return compare, best, models
+
+
+def bench(func, questions, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for question in questions:
+            func(question)
+    return len(questions) * repeat / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default="query_corpus.json")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+    if not corpus:
+        sys.exit("Empty corpus.")
+
+    mismatches = []
+    for case in corpus:
+        parsed = parse_query(case["question"])
+        expected = (case["intent"], tuple(case["models"]), case["max_price"], tuple(case["criteria"]))
+        if tuple(parsed) != expected:
+            mismatches.append({"question": case["question"], "expected": expected, "parsed": tuple(parsed)})
+
+    questions = [case["question"] for case in corpus]
+    legacy_rate = bench(legacy_parse, questions, args.repeat)
+    uncached_rate = bench(parse_query.__wrapped__, questions, args.repeat)
+    cached_rate = bench(parse_query, questions, args.repeat)
+
+    report = {
+        "questions": len(questions),
+        "legacy_per_sec": round(legacy_rate),
+        "parse_query_per_sec": round(uncached_rate),
+        "parse_query_cached_per_sec": round(cached_rate),
+        "speedup": round(uncached_rate / legacy_rate, 2),
+        "speedup_cached": round(cached_rate / legacy_rate, 2),
+        "mismatches": mismatches,
+    }
+    print(json.dumps(report, indent=2, default=list))
+    sys.exit(1 if mismatches else 0)
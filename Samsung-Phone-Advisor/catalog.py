@@ -0,0 +1,132 @@
+import re
+import threading
+import time
+
+NOISE_WORDS_RE = re.compile(r'\b(?:samsung|galaxy)\b', re.IGNORECASE)
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_model(name):
+    """'Samsung Galaxy S25 FE' -> 's25 fe', 'Galaxy S25+' -> 's25 plus'.
+
+    Lowercase, brand words and punctuation dropped; "+" is kept as the word "plus" so
+    S25+ and S25 stay distinct models.
+    """
+    name = NOISE_WORDS_RE.sub(" ", name).lower().replace("+", " plus ")
+    return " ".join(NON_ALNUM_RE.sub(" ", name).split())
+
+
+def raw_name(name):
+    """Model name without brand words, lowercased, punctuation kept: 'Galaxy S25+' -> 's25+'."""
+    return " ".join(NOISE_WORDS_RE.sub(" ", name).lower().split())
+
+
+def trigrams(text):
+    padded = f"  {text.replace(' ', '')} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PhoneCatalog:
+    """Process-local, in-memory index of the phones table for model lookup without DB round-trips.
+
+    Rows are indexed three ways: by normalized model ('s25 fe'), by its first token ('s25')
+    and by character trigrams. lookup() ranks candidates: exact match, then same model token
+    (shortest name first, so 'S25' prefers 'Galaxy S25' over 'Galaxy S25 Ultra'), then
+    substring, then trigram similarity for typos.
+    """
+
+    def __init__(self, max_age=300, min_similarity=0.4):
+        self.max_age = max_age              # seconds before is_stale() asks for a reload
+        self.min_similarity = min_similarity
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._shared = {}                   # key -> other models with the same key ('S25 Plus' next to 'S25+')
+        self._by_model = {}
+        self._by_token = {}
+        self._by_trigram = {}
+
+    def __len__(self):
+        return len(self._by_model)
+
+    def load(self, phones):
+        """Rebuild the index from phone dicts (each with a 'model' key); swaps in atomically.
+
+        Returns the model names that were added, removed or changed since the previous load.
+        Different models that normalize to the same key ('Galaxy S25+', 'Galaxy S25 Plus') are
+        all kept; lookup() prefers the one whose name matches the question as written.
+        """
+        rows, shared, by_token, by_trigram = {}, {}, {}, {}
+        for phone in phones:
+            key = normalize_model(phone["model"])
+            if not key:
+                continue
+            if key in rows and rows[key]["model"] != phone["model"]:
+                print(f"Catalog key collision: '{rows[key]['model']}' and '{phone['model']}' both normalize to '{key}'.")
+                shared.setdefault(key, {})[phone["model"]] = phone
+                continue
+            rows[key] = phone
+            by_token.setdefault(key.split()[0], []).append(key)
+            for gram in trigrams(key):
+                by_trigram.setdefault(gram, set()).add(key)
+        by_model = {phone["model"]: phone for phone in rows.values()}
+        for models in shared.values():
+            by_model.update(models)
+        with self._lock:
+            previous = self._by_model
+            self._rows, self._shared, self._by_model = rows, shared, by_model
+            self._by_token, self._by_trigram = by_token, by_trigram
+            self.loaded_at = time.monotonic()
+        print(f"Phone catalog loaded: {len(by_model)} models.")
+        return {model for model, phone in by_model.items() if previous.get(model) != phone} | \
+               {model for model in previous if model not in by_model}
+
+    def is_stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age
+
+    def postpone_reload(self):
+        """After a failed reload: keep the current index and retry after max_age, not on every request."""
+        self.loaded_at = time.monotonic()
+
+    def candidates(self, term, limit=5):
+        """Ranked (score, phone) pairs for a model mention like 'M36' or 'Galaxy S25 FE'."""
+        query = normalize_model(term)
+        if not query:
+            return []
+        rows, by_token, by_trigram = self._rows, self._by_token, self._by_trigram
+
+        if query in rows:
+            phone = rows[query]
+            if query in self._shared:
+                # Several models share the key: the one spelled like the question wins
+                wanted = raw_name(term)
+                phone = next((p for p in [phone, *self._shared[query].values()] if raw_name(p["model"]) == wanted), phone)
+            return [(1.0, phone)]
+
+        scores = {}
+        # Same model token, e.g. 's25' -> 's25', 's25 fe', 's25 ultra'; more extra words = lower score
+        for key in by_token.get(query.split()[0], []):
+            if key.startswith(query):
+                scores[key] = 0.9 - 0.01 * (len(key) - len(query))
+        # Trigram similarity (Jaccard) for typos and spacing ('s25fe', 'm 36')
+        query_grams = trigrams(query)
+        overlap = {}
+        for gram in query_grams:
+            for key in by_trigram.get(gram, ()):
+                overlap[key] = overlap.get(key, 0) + 1
+        for key, shared in overlap.items():
+            if key in scores:
+                continue
+            similarity = shared / len(query_grams | trigrams(key))
+            if query in key:
+                similarity = max(similarity, 0.5)
+            if similarity >= self.min_similarity:
+                scores[key] = 0.8 * similarity
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(score, rows[key]) for key, score in ranked]
+
+    def lookup(self, term):
+        """Best matching phone dict, or None."""
+        matches = self.candidates(term, limit=1)
+        return matches[0][1] if matches else None
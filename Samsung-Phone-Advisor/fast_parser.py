@@ -0,0 +1,55 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import lxml.html
+
+# Only rows that can produce a spec: camera (by data-spec or a "camera" key) and price
+SPEC_ROWS = lxml.html.etree.XPath(
+    "//table//tr[(.//td)[2] and ("
+    "(.//td)[2][@data-spec='cam1modules' or @data-spec='price']"
+    " or contains(translate(string((.//td)[1]), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'camera')"
+    ")]"
+)
+CELLS = lxml.html.etree.XPath(".//td")
+PRICE_RE = re.compile(r'(?:€|₹|US\$|\$)\s*([\d,]+(?:\.\d{1,2})?)')
+TEXT_RUN = re.compile(r'>[^<]*\r[^<]*<')
+
+
+def _keep_carriage_returns(html):
+    """libxml2 normalizes CRLF to LF while html.parser keeps it; escape CR in text runs to stay identical."""
+    if "\r" not in html:
+        return html
+    return TEXT_RUN.sub(lambda m: m.group(0).replace("\r", "&#13;"), html)
+
+
+def parse_detail_html(html):
+    """Fast, silent equivalent of scrape_common.parse_detail_page working on raw HTML.
+
+    lxml parses the page in C and a precompiled XPath selects only the camera/price rows,
+    instead of walking every table row of a full html.parser BeautifulSoup tree.
+    """
+    specs = {}
+    try:
+        root = lxml.html.document_fromstring(_keep_carriage_returns(html))
+    except (ValueError, lxml.html.etree.ParserError) as e:
+        print(f"Error parsing detail page: {e}")
+        return specs
+
+    for row in SPEC_ROWS(root):
+        cells = CELLS(row)
+        key = cells[0].text_content().strip()
+        value = cells[1].text_content().strip()
+        data_spec = cells[1].get("data-spec")
+
+        if "camera" in key.lower() or data_spec == "cam1modules":
+            specs["camera"] = value
+        if data_spec == "price":
+            price_match = PRICE_RE.search(value)
+            specs["price"] = float(price_match.group(1).replace(',', '')) if price_match else None
+    return specs
+
+
+def parse_detail_pages(pages, processes=None, chunksize=16):
+    """Parse many detail pages on a process pool; returns specs in input order."""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(parse_detail_html, pages, chunksize=chunksize))
@@ -0,0 +1,72 @@
+"""Concurrent /ask load test against a running server.
+
+Usage:
+    RESPONSE_CACHE_TTL=0 DB_POOL_SIZE=16 uvicorn app:app &
+    python load_test.py --url http://127.0.0.1:8000 --concurrency 1 4 16 --requests 400
+
+Compare and spec questions are resolved through the in-memory catalog and make no DB
+queries, so they cannot show pool behaviour. The default mix is DB-bound instead: every
+question is a "best <criterion> under $N" ranking, which runs one SQL query. With the answer
+cache disabled (RESPONSE_CACHE_TTL=0), throughput shows how /ask scales with concurrent
+connections. Pass --questions to drive your own mix.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import httpx
+
+CRITERIA = ["battery", "camera", "display", "price"]
+
+
+def db_bound_questions(n=200, seed=0):
+    """Ranking questions with varied criteria and price ceilings; each one is an SQL query."""
+    rng = random.Random(seed)
+    return [f"Best {rng.choice(CRITERIA)} under ${rng.randrange(150, 1600, 10)}" for _ in range(n)]
+
+
+async def run_level(client, url, questions, concurrency, requests):
+    """Send `requests` POSTs from `concurrency` workers; returns (requests/sec, errors)."""
+    counter = itertools.count()
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < requests:
+            try:
+                response = await client.post(url, json={"question": questions[i % len(questions)]})
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start), errors
+
+
+async def main(args):
+    questions = db_bound_questions()
+    if args.questions:
+        with open(args.questions, encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    report = []
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        for concurrency in args.concurrency:
+            rate, errors = await run_level(client, args.url.rstrip("/") + "/ask", questions, concurrency, args.requests)
+            report.append({"concurrency": concurrency, "requests_per_sec": round(rate, 1), "errors": errors})
+            print(f"concurrency={concurrency}: {rate:.1f} req/s, {errors} errors")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--questions", help="File with one question per line (default: DB-bound ranking mix)")
+    asyncio.run(main(parser.parse_args()))
@@ -1,4 +1,11 @@
-from sqlalchemy import Column, String, Integer, create_engine
+import re
+from datetime import datetime
+
+from sqlalchemy import Column, Date, Float, Index, String, Integer, and_, create_engine, func, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -14,13 +21,163 @@ class Phone(Base):
     camera = Column(String, nullable=True)
     ram = Column(String, nullable=True)
     storage = Column(String, nullable=True)
-    price = Column(Integer, nullable=True)
+    price = Column(Integer, nullable=True, index=True)
+    # Numeric specs parsed from the text columns at ingest time (see numeric_specs)
+    battery_mah = Column(Integer, nullable=True, index=True)
+    main_camera_mp = Column(Integer, nullable=True, index=True)
+    display_inches = Column(Float, nullable=True, index=True)
+    ram_gb = Column(Float, nullable=True, index=True)
+    storage_gb = Column(Float, nullable=True, index=True)
+    released_on = Column(Date, nullable=True, index=True)
+
+    __table_args__ = (
+        # "best battery under $X": range on price, ordered by battery
+        Index("ix_phones_price_battery_mah", "price", "battery_mah"),
+    )
+
+BATTERY_RE = re.compile(r'(\d+)\s*mAh')
+CAMERA_MP_RE = re.compile(r'(\d+)\s*MP')
+DISPLAY_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:″|"|inch)')
+SIZE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(TB|GB|MB)', re.IGNORECASE)
+SIZE_UNITS_GB = {"tb": 1024.0, "gb": 1.0, "mb": 1 / 1024}
+NUMERIC_FIELDS = ["battery_mah", "main_camera_mp", "display_inches", "ram_gb", "storage_gb", "released_on"]
+
+def _size_gb(value):
+    match = SIZE_RE.search(value) if value else None
+    return float(match.group(1)) * SIZE_UNITS_GB[match.group(2).lower()] if match else None
+
+def parse_release_date(value):
+    """'Jun 2025' or 'June 2025' -> date(2025, 6, 1); None if unparseable."""
+    for fmt in ("%b %Y", "%B %Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def numeric_specs(specs):
+    """Numeric columns parsed from the text specs (None where a value cannot be parsed)."""
+    battery = BATTERY_RE.search(specs.get("battery") or "")
+    camera = CAMERA_MP_RE.search((specs.get("camera") or "").replace('\r\n', ' '))
+    display = DISPLAY_RE.search(specs.get("display") or "")
+    return {
+        "battery_mah": int(battery.group(1)) if battery else None,
+        "main_camera_mp": int(camera.group(1)) if camera else None,
+        "display_inches": float(display.group(1)) if display else None,
+        "ram_gb": _size_gb(specs.get("ram")),
+        "storage_gb": _size_gb(specs.get("storage")),
+        "released_on": parse_release_date(specs.get("release_date")),
+    }
+
+def migrate_numeric_columns(engine):
+    """Add the numeric columns/indexes to an existing phones table and backfill rows that lack them.
+
+    Idempotent: safe to run on every start.
+    """
+    table = Phone.__table__
+    existing = {col["name"] for col in inspect(engine).get_columns(table.name)}
+    with engine.begin() as conn:
+        for name in NUMERIC_FIELDS:
+            if name not in existing:
+                col_type = table.c[name].type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {col_type}"))
+    for index in table.indexes:
+        index.create(engine, checkfirst=True)
+
+    # Backfill rows with text specs but no parsed numbers yet
+    columns = ["model"] + TEXT_FIELDS
+    needs_backfill = and_(*[table.c[name].is_(None) for name in NUMERIC_FIELDS])
+    with engine.begin() as conn:
+        rows = conn.execute(table.select().with_only_columns(*[table.c[c] for c in columns]).where(needs_backfill)).mappings().all()
+        updates = []
+        for row in rows:
+            values = {k: v for k, v in numeric_specs(row).items() if v is not None}
+            if values:
+                updates.append((row["model"], values))
+        for model, values in updates:
+            conn.execute(table.update().where(table.c.model == model).values(**values))
+        if updates:
+            print(f"Backfilled numeric specs for {len(updates)} phones.")
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_url(db_url):
+    """postgresql://... -> postgresql+asyncpg://..., sqlite://... -> sqlite+aiosqlite://..."""
+    url = make_url(db_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{url.get_backend_name()}'.")
+    return url.set(drivername=driver)
 
-def get_session(db_url):
+def engine_options(db_url, pool_size=None, max_overflow=None, pool_pre_ping=True):
+    """Pool settings for create_engine / create_async_engine (None keeps SQLAlchemy's default)."""
+    options = {"pool_pre_ping": pool_pre_ping}
+    url = make_url(db_url)
+    # In-memory SQLite uses a single shared connection, not a sized pool
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    if pool_size is not None:
+        options["pool_size"] = pool_size
+    if max_overflow is not None:
+        options["max_overflow"] = max_overflow
+    return options
+
+def get_async_session(db_url, pool_size=None, max_overflow=None, pool_pre_ping=True):
+    """async_sessionmaker on an asyncpg/aiosqlite engine; the schema is created by get_session."""
     try:
-        engine = create_engine(db_url)
+        engine = create_async_engine(async_url(db_url),
+                                     **engine_options(db_url, pool_size, max_overflow, pool_pre_ping))
+        return async_sessionmaker(engine, expire_on_commit=False)
+    except Exception as e:
+        raise ValueError(f"Failed to create async database engine: {e}")
+
+def get_session(db_url, pool_size=None, max_overflow=None, pool_pre_ping=True):
+    try:
+        engine = create_engine(db_url, **engine_options(db_url, pool_size, max_overflow, pool_pre_ping))
         Base.metadata.create_all(engine)
+        migrate_numeric_columns(engine)
         Session = sessionmaker(bind=engine)
         return Session  # Return the sessionmaker factory
     except Exception as e:
-        raise ValueError(f"Failed to create database engine: {e}")
\ No newline at end of file
+        raise ValueError(f"Failed to create database engine: {e}")
+
+TEXT_FIELDS = ["release_date", "display", "battery", "camera", "ram", "storage"]
+UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+def merge_phone_specs(rows):
+    """Collapse duplicate models, letting later non-empty values win (same rule as the upsert)."""
+    merged = {}
+    for row in rows:
+        current = merged.setdefault(row["model"], {"model": row["model"]})
+        for key, value in row.items():
+            if key in TEXT_FIELDS and value:
+                current[key] = value
+            elif key == "price" and value is not None:
+                current[key] = value
+    return list(merged.values())
+
+def upsert_phones(session, phones, batch_size=500):
+    """Write scraped specs with one INSERT ... ON CONFLICT (model) DO UPDATE per batch.
+
+    Existing text fields are only overwritten by non-empty values and price only by a
+    non-NULL value, as in the per-row scraper update. Returns the number of rows written.
+    """
+    columns = Phone.__table__.columns.keys()
+    rows = merge_phone_specs(p for p in phones if p.get("model"))
+    rows = [{col: row.get(col) for col in columns} | numeric_specs(row) for row in rows]
+    if not rows:
+        return 0
+
+    insert = UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        raise ValueError(f"Bulk upsert is not supported for dialect '{session.get_bind().dialect.name}'.")
+
+    table = Phone.__table__
+    for start in range(0, len(rows), batch_size):
+        stmt = insert(table).values(rows[start:start + batch_size])
+        update = {col: func.coalesce(func.nullif(stmt.excluded[col], ""), table.c[col]) for col in TEXT_FIELDS}
+        for col in ["price"] + NUMERIC_FIELDS:
+            update[col] = func.coalesce(stmt.excluded[col], table.c[col])
+        session.execute(stmt.on_conflict_do_update(index_elements=[table.c.model], set_=update))
+    session.commit()
+    return len(rows)
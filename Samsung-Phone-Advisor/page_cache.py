@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+
+
+class PageCache:
+    """On-disk HTTP page cache for conditional re-scrapes.
+
+    For every URL it keeps the body (one file per URL), the ETag / Last-Modified
+    validators and a SHA-256 of the body in an index.json. Scrapers send the validators
+    as If-None-Match / If-Modified-Since and treat a 304, or a 200 whose body hashes the
+    same as before, as "unchanged" so parsing and the DB write can be skipped.
+
+    A changed page stays pending until commit(): its body and validators only enter the
+    cache once the caller has persisted what it parsed from it. A failed DB write therefore
+    leaves the page looking changed on the next run.
+    """
+
+    def __init__(self, cache_dir=".page_cache"):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = {}
+        self.pending = {}   # url -> (index entry, body) awaiting commit()
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, self._key(url) + ".html")
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a URL seen before (empty dict otherwise)."""
+        entry = self.index.get(url)
+        headers = {}
+        if entry and os.path.exists(self._body_path(url)):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, url):
+        """Cached body of a URL, or None."""
+        path = self._body_path(url)
+        if url not in self.index or not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def store(self, url, body, headers):
+        """Record a 200 response; returns True if the body differs from the cached one (or is new).
+
+        An unchanged body only refreshes the validators; a changed one is held until commit(url).
+        """
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        entry = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha256": digest,
+        }
+        changed = self.index.get(url, {}).get("sha256") != digest or not os.path.exists(self._body_path(url))
+        if changed:
+            self.pending[url] = (entry, body)
+        else:
+            self.index[url] = entry
+        return changed
+
+    def commit(self, urls):
+        """Accept pending pages (e.g. after their rows were saved): write the bodies and index entries."""
+        for url in urls:
+            if url not in self.pending:
+                continue
+            entry, body = self.pending.pop(url)
+            with open(self._body_path(url), "w", encoding="utf-8") as f:
+                f.write(body)
+            self.index[url] = entry
+
+    def save(self):
+        """Write the committed index; call once at the end of a scrape. Uncommitted pages are dropped."""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
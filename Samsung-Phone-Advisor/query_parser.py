@@ -0,0 +1,58 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+COMPARE = "compare"
+BEST = "best"
+SPECS = "specs"
+
+# Model mentions ("M36", "S25+", "S25 FE") before and/or/vs/versus (any case) or the end of the
+# question ("?" allowed). Same capture as the original case-insensitive extractor; a lookbehind
+# replaces its optional "Samsung "/"Galaxy " prefix, which never changed what was captured.
+MODEL_RE = re.compile(r"(?<![A-Za-z0-9])([A-Za-z]\d+\+?(?:\s\w+)?)(?=\s+(?i:and|or|vs|versus)\b|\s*[?.!]*\s*$)")
+# Keyword patterns run on the lowercased question
+COMPARE_RE = re.compile(r"\bcompar(?:e|ed|ing|ison)\b|\bvs\.?(?=\s)|\bversus\b")
+BEST_RE = re.compile(r"\bbest\s+(battery|camera|display|screen|price)\b")
+PRICE_CEILING_RE = re.compile(r"\b(?:under|below|less\s+than|cheaper\s+than|up\s+to)\s*(?:\$|usd\s*)?(\d[\d,]*(?:\.\d+)?)(k)?\b")
+CRITERION_ALIASES = {"screen": "display"}
+
+
+class ParsedQuery(NamedTuple):
+    intent: str                       # COMPARE, BEST or SPECS
+    models: Tuple[str, ...]           # model mentions in question order, e.g. ("M36", "F56")
+    max_price: Optional[float]        # "under $700" -> 700.0
+    criteria: Tuple[str, ...]         # ranking criteria for BEST, e.g. ("battery",)
+
+    def cache_intent(self):
+        """Intent plus the parameters that change the answer, e.g. 'best battery <700'."""
+        if self.intent != BEST:
+            return self.intent
+        ceiling = f" <{self.max_price:g}" if self.max_price is not None else ""
+        return f"{BEST} {','.join(self.criteria)}{ceiling}"
+
+
+@lru_cache(maxsize=4096)
+def parse_query(question: str) -> ParsedQuery:
+    """Intent, models, price ceiling and criteria of a question, parsed once.
+
+    "best <criterion>" wins over a comparison (the answer is a ranking); otherwise any
+    compare/vs/versus makes it a comparison, and everything else is a spec lookup.
+    Keyword patterns only run when their keyword occurs in the lowercased question.
+    Results are cached: popular questions repeat.
+    """
+    lower = question.lower()
+    models = tuple(MODEL_RE.findall(question))
+    criteria = ()
+    max_price = None
+    if "best" in lower:
+        criteria = tuple(dict.fromkeys(CRITERION_ALIASES.get(c, c) for c in BEST_RE.findall(lower)))
+    if criteria:
+        ceiling = PRICE_CEILING_RE.search(lower)
+        if ceiling:
+            max_price = float(ceiling.group(1).replace(",", ""))
+            if ceiling.group(2):
+                max_price *= 1000
+        return ParsedQuery(BEST, models, max_price, criteria)
+    if ("compar" in lower or "vs" in lower or "versus" in lower) and COMPARE_RE.search(lower):
+        return ParsedQuery(COMPARE, models, None, ())
+    return ParsedQuery(SPECS, models, None, ())
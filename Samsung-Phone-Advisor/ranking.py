@@ -0,0 +1,80 @@
+import numpy as np
+
+# Criterion -> (phone dict field, higher is better)
+CRITERIA = {
+    "battery": ("battery_mah", True),
+    "camera": ("main_camera_mp", True),
+    "display": ("display_inches", True),
+    "price": ("price", False),
+    "recency": ("released_on", True),
+}
+DEFAULT_WEIGHTS = {"battery": 1.0, "camera": 1.0, "display": 0.5, "price": 1.0, "recency": 0.5}
+
+
+def _number(value):
+    """Phone dict value as a float; NaN for missing/"Unknown", dates as day ordinals."""
+    if value is None or value == "Unknown":
+        return np.nan
+    if hasattr(value, "toordinal"):
+        return float(value.toordinal())
+    return float(value)
+
+
+class PhoneRanker:
+    """Weighted multi-criteria ranking over the catalog rows, scored as array operations.
+
+    load() turns the rows into a (phones x criteria) matrix once, min-max normalized per
+    column to 0..1 (inverted for price, missing values score 0). rank() is then one
+    matrix-vector product plus a partial sort, however many phones there are.
+    """
+
+    def __init__(self):
+        self.phones = []
+        self.prices = np.empty(0)
+        self.features = np.empty((0, len(CRITERIA)))
+
+    def __len__(self):
+        return len(self.phones)
+
+    def load(self, phones):
+        phones = list(phones)
+        raw = np.array([[_number(p.get(field)) for field, _ in CRITERIA.values()] for p in phones],
+                       dtype=np.float64).reshape(len(phones), len(CRITERIA))
+        with np.errstate(invalid="ignore"):
+            low = np.nanmin(raw, axis=0, initial=np.inf, where=~np.isnan(raw))
+            high = np.nanmax(raw, axis=0, initial=-np.inf, where=~np.isnan(raw))
+            span = np.where(high > low, high - low, 1.0)
+            features = (raw - low) / span
+        higher_is_better = np.array([better for _, better in CRITERIA.values()])
+        features = np.where(higher_is_better, features, 1.0 - features)
+        self.phones, self.prices, self.features = phones, raw[:, list(CRITERIA).index("price")], np.nan_to_num(features)
+
+    def rank(self, weights=None, limit=10, max_price=None, models=None):
+        """Top `limit` phones as (score, phone) pairs, best first.
+
+        weights maps criterion name -> weight (see CRITERIA); scores are normalized to 0..1.
+        max_price drops phones without a price under it; models restricts to those model names.
+        """
+        weights = DEFAULT_WEIGHTS if weights is None else weights
+        unknown = set(weights) - set(CRITERIA)
+        if unknown:
+            raise ValueError(f"Unknown criteria: {', '.join(sorted(unknown))}. Use {', '.join(CRITERIA)}.")
+        vector = np.array([float(weights.get(name, 0.0)) for name in CRITERIA])
+        if (vector < 0).any() or vector.sum() == 0:
+            raise ValueError("Weights must be non-negative with at least one above zero.")
+
+        scores = self.features @ (vector / vector.sum())
+        mask = np.ones(len(self.phones), dtype=bool)
+        if max_price is not None:
+            with np.errstate(invalid="ignore"):
+                mask &= self.prices < max_price
+        if models is not None:
+            wanted = set(models)
+            mask &= np.fromiter((p["model"] in wanted for p in self.phones), dtype=bool, count=len(self.phones))
+        candidates = np.flatnonzero(mask)
+        if limit < 1:
+            return []
+        if limit < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(float(scores[i]), self.phones[i]) for i in order]
@@ -0,0 +1,187 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+ANY_MODEL = "*"   # entries that depend on the whole catalog (e.g. rankings)
+
+
+def cache_key(intent, models):
+    """Canonical key: the intent plus the sorted set of resolved model names."""
+    return json.dumps([intent, sorted(set(models))])
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry and a model -> keys index for invalidation."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()   # key -> (value, models, expires_at)
+        self._by_model = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, models, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, models, time.time() + ttl)
+            for model in models:
+                self._by_model.setdefault(model, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, models):
+        with self._lock:
+            keys = set(self._by_model.get(ANY_MODEL, ()))
+            for model in models:
+                keys |= self._by_model.get(model, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key):
+        _, models, _ = self._entries.pop(key)
+        for model in models:
+            keys = self._by_model.get(model)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._by_model[model]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """File-backed cache that several uvicorn workers (and the scraper) can share.
+
+    Hits do not write: their last_used times are buffered per process and flushed in one
+    transaction every `touch_batch` hits or `touch_interval` seconds, and before set() evicts.
+    """
+
+    def __init__(self, path, maxsize=10000, touch_batch=256, touch_interval=5.0):
+        self.path = path
+        self.maxsize = maxsize
+        self.touch_batch = touch_batch
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._touched = {}   # key -> last hit time, not yet written
+        self._pending_hits = 0
+        self._flushed_at = time.time()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS response_cache ("
+                         "key TEXT PRIMARY KEY, value TEXT, expires_at REAL, last_used REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS response_cache_models ("
+                         "model TEXT, key TEXT, PRIMARY KEY (model, key))")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT value FROM response_cache WHERE key = ? AND expires_at >= ?", (key, now)).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._touched[key] = now
+            self._pending_hits += 1
+            due = self._pending_hits >= self.touch_batch or now - self._flushed_at >= self.touch_interval
+        if due:
+            with conn:
+                self._flush_touched(conn, now)
+        return json.loads(row[0])
+
+    def _flush_touched(self, conn, now):
+        """Write the buffered last_used times (inside the caller's transaction)."""
+        with self._lock:
+            touched, self._touched, self._flushed_at = self._touched, {}, now
+            self._pending_hits = 0
+        conn.executemany("UPDATE response_cache SET last_used = ? WHERE key = ? AND last_used < ?",
+                         [(used, key, used) for key, used in touched.items()])
+
+    def set(self, key, value, models, ttl):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            self._flush_touched(conn, now)
+            conn.execute("INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?)",
+                         (key, json.dumps(value), now + ttl, now))
+            conn.execute("DELETE FROM response_cache_models WHERE key = ?", (key,))
+            conn.executemany("INSERT OR IGNORE INTO response_cache_models VALUES (?, ?)", [(m, key) for m in models])
+            # Evict expired entries, then least recently used beyond maxsize
+            conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (now,))
+            conn.execute("DELETE FROM response_cache WHERE key IN (SELECT key FROM response_cache "
+                         "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+            conn.execute("DELETE FROM response_cache_models WHERE key NOT IN (SELECT key FROM response_cache)")
+
+    def invalidate(self, models):
+        conn = self._connect()
+        names = list(models) + [ANY_MODEL]
+        placeholders = ",".join("?" * len(names))
+        with conn:
+            keys = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT key FROM response_cache_models WHERE model IN ({placeholders})", names)]
+            conn.executemany("DELETE FROM response_cache WHERE key = ?", [(k,) for k in keys])
+            conn.executemany("DELETE FROM response_cache_models WHERE key = ?", [(k,) for k in keys])
+        return len(keys)
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+
+class ResponseCache:
+    """LRU + TTL cache of /ask answers, invalidated when the scraper updates a cached phone."""
+
+    def __init__(self, backend=None, ttl=600):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, models):
+        self.backend.set(key, value, list(models), self.ttl)
+
+    def invalidate_models(self, models):
+        removed = self.backend.invalidate(list(models))
+        self.invalidations += removed
+        return removed
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "invalidations": self.invalidations,
+            "ttl": self.ttl,
+        }
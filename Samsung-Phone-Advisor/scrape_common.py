@@ -0,0 +1,95 @@
+import re
+from urllib.parse import urljoin
+
+# Scraper constants and HTML parsers shared by app.py and async_scraper.py. Kept free of
+# import side effects (no engines, migration or caches), so the async scraper and the
+# benchmarks can import them without a database.
+BASE_URL = "https://www.gsmarena.com/"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+def parse_title_specs(title):
+    specs = {}
+    try:
+        if "Features " in title:
+            features_part = title.split("Features ")[1]
+        else:
+            features_part = title
+        parts = [p.strip() for p in features_part.split(",")]
+        for part in parts:
+            if "display" in part.lower():
+                specs["display"] = part
+            elif "chipset" in part.lower():
+                specs["chipset"] = part
+            elif "battery" in part.lower():
+                specs["battery"] = part
+            elif "storage" in part.lower():
+                specs["storage"] = part
+            elif "ram" in part.lower():
+                specs["ram"] = part
+        date_match = re.search(r"Announced ([A-Za-z]+ \d{4})", title)
+        specs["release_date"] = date_match.group(1) if date_match else None
+        specs["camera"] = None
+        specs["price"] = None
+        return specs
+    except Exception as e:
+        print(f"Error parsing title: {e}")
+        return specs
+
+def parse_detail_page(soup):
+    specs = {}
+    try:
+        # Find all tables, fallback to all if specific classes not found
+        tables = soup.find_all("table")  # Simplified, as HTML shows no specific class
+        print(f"Found {len(tables)} tables on detail page: {soup.title.text if soup.title else 'No title'}")
+        
+        for table in tables:
+            th = table.find("th")
+            table_category = th.text.strip() if th else "Unknown"
+            rows = table.find_all("tr")
+            for row in rows:
+                cells = row.find_all("td")
+                if len(cells) >= 2:
+                    key = cells[0].text.strip()
+                    value = cells[1].text.strip()
+                    print(f"  Table '{table_category}': Key='{key}' Value='{value[:50]}...'")
+                    
+                    # Camera extraction: check key or data-spec
+                    if any(c_phrase.lower() in key.lower() for c_phrase in ["Main Camera", "Camera", "Primary camera", "Rear camera"]) or cells[1].get("data-spec") == "cam1modules":
+                        specs["camera"] = value
+                        print(f"    → Extracted camera: {value[:50]}...")
+                    
+                    # Price extraction: handle €, ₹, $, US$, and decimals
+                    if "Price" in key.lower() or cells[1].get("data-spec") == "price":
+                        price_match = re.search(r'(?:€|₹|US\$|\$)\s*([\d,]+(?:\.\d{1,2})?)', value)
+                        specs["price"] = float(price_match.group(1).replace(',', '')) if price_match else None
+                        print(f"    → Extracted price: {specs.get('price', 'None')}")
+        
+        return specs
+    except Exception as e:
+        print(f"Error parsing detail page: {e}")
+        return specs
+    
+
+def parse_list_entry(a_tag, base_url=BASE_URL):
+    href = a_tag.get('href', '')
+    if not href:
+        return None
+    url = urljoin(base_url, href)
+    
+    model_span = a_tag.select_one("strong span")
+    model = model_span.text.strip() if model_span else None
+    
+    if not model:
+        return None
+    
+    specs = {"model": model}
+    
+    img = a_tag.find("img")
+    if img and img.get("title"):
+        specs.update(parse_title_specs(img['title']))
+    
+    specs["url"] = url
+    return specs
@@ -1,7 +1,7 @@
-import re
+from query_parser import parse_query
 question="Compare Samsung Galaxy M36 and Samsung Galaxy F56"
 
 
-models = re.findall(r'(?:Samsung\s)?(?:Galaxy\s)?([A-Z]\d+(?:\s\w+)?)(?=\s+(?:and|or|vs)|$)', question, re.IGNORECASE)
-models = [m.strip() for m in models if m.strip()]
-print(f"Extracted models from query: {models}")
\ No newline at end of file
+query = parse_query(question)
+print(f"Extracted models from query: {list(query.models)}")
+print(f"Parsed query: {query}")